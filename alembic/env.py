@@ -29,6 +29,9 @@ def run_migrations_online() -> None:
         context.configure(connection=connection, target_metadata=target_metadata)
         with context.begin_transaction():
             context.run_migrations()
+        # The execute() calls above autobegin a transaction, which
+        # begin_transaction() joins rather than commits
+        connection.commit()
 
 
 run_migrations_online()
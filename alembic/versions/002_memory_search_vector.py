@@ -0,0 +1,42 @@
+"""Stored full-text search vector on memories
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # array_to_string() is only STABLE, which generated columns reject; text[]
+    # output never depends on session settings, so an IMMUTABLE wrapper is safe.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION twoof.tags_to_text(tags text[])
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT coalesce(array_to_string(tags, ' '), '') $$
+    """)
+    op.execute("""
+        ALTER TABLE twoof.memories
+        ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'C') ||
+            setweight(to_tsvector('english', twoof.tags_to_text(tags)), 'D')
+        ) STORED
+    """)
+    op.create_index(
+        "idx_memories_search", "memories", ["search_vector"],
+        schema="twoof", postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_memories_search", table_name="memories", schema="twoof")
+    op.drop_column("memories", "search_vector", schema="twoof")
+    op.execute("DROP FUNCTION IF EXISTS twoof.tags_to_text(text[])")
@@ -0,0 +1,32 @@
+"""Composite index backing keyset pagination of the memories timeline
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_memories_timeline",
+        "memories",
+        [
+            "household_id",
+            sa.text("pinned DESC"),
+            sa.text("memory_date DESC"),
+            sa.text("created_at DESC"),
+            sa.text("id DESC"),
+        ],
+        schema="twoof",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_memories_timeline", table_name="memories", schema="twoof")
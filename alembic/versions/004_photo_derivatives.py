@@ -0,0 +1,26 @@
+"""Resized WebP derivatives recorded on photos
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "photos",
+        sa.Column("derivatives", JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")),
+        schema="twoof",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("photos", "derivatives", schema="twoof")
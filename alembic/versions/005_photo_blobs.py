@@ -0,0 +1,35 @@
+"""Content-addressed photo blobs with reference counts
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "photo_blobs",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("file_path", sa.Text, nullable=False),
+        sa.Column("size_bytes", sa.BigInteger, nullable=False),
+        sa.Column("ref_count", sa.Integer, nullable=False, server_default=sa.text("0")),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        schema="twoof",
+    )
+    # Photos uploaded before this revision keep their own uuid-named file and
+    # a NULL content_hash.
+    op.add_column("photos", sa.Column("content_hash", sa.String(64), nullable=True), schema="twoof")
+    op.create_index("idx_photos_content_hash", "photos", ["content_hash"], schema="twoof")
+
+
+def downgrade() -> None:
+    op.drop_index("idx_photos_content_hash", table_name="photos", schema="twoof")
+    op.drop_column("photos", "content_hash", schema="twoof")
+    op.drop_table("photo_blobs", schema="twoof")
@@ -0,0 +1,37 @@
+"""Precomputed next occurrence for milestones
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "006"
+down_revision = "005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("milestones", sa.Column("next_occurrence", sa.Date, nullable=True), schema="twoof")
+    # Adding whole years to a date clamps Feb 29 to Feb 28 in non-leap years.
+    op.execute("""
+        UPDATE twoof.milestones SET next_occurrence = CASE
+            WHEN NOT recurring THEN milestone_date
+            WHEN (milestone_date + make_interval(years => (extract(year FROM current_date) - extract(year FROM milestone_date))::int))::date >= current_date
+                THEN (milestone_date + make_interval(years => (extract(year FROM current_date) - extract(year FROM milestone_date))::int))::date
+            ELSE (milestone_date + make_interval(years => (extract(year FROM current_date) - extract(year FROM milestone_date))::int + 1))::date
+        END
+    """)
+    op.alter_column("milestones", "next_occurrence", nullable=False, schema="twoof")
+    op.create_index(
+        "idx_milestones_next", "milestones", ["household_id", "next_occurrence"], schema="twoof",
+    )
+    op.drop_index("idx_milestones_household", table_name="milestones", schema="twoof")
+
+
+def downgrade() -> None:
+    op.create_index("idx_milestones_household", "milestones", ["household_id"], schema="twoof")
+    op.drop_index("idx_milestones_next", table_name="milestones", schema="twoof")
+    op.drop_column("milestones", "next_occurrence", schema="twoof")
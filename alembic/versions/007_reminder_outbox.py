@@ -0,0 +1,38 @@
+"""Outbox for due milestone and anniversary reminders
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reminder_outbox",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("idempotency_key", sa.String(200), nullable=False, unique=True),
+        sa.Column("household_id", UUID(as_uuid=True), sa.ForeignKey("twoof.households.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("subject_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("occurs_on", sa.Date, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        schema="twoof",
+    )
+    op.create_index(
+        "idx_reminder_outbox_pending", "reminder_outbox", ["created_at"],
+        schema="twoof", postgresql_where=sa.text("sent_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("reminder_outbox", schema="twoof")
@@ -0,0 +1,154 @@
+"""Per-household statistics maintained by triggers
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # kind/key pairs: ("month", "YYYY-MM"), ("tag", <tag>), ("mood", <mood>),
+    # ("photos", ""). No FK to households: the counters are adjusted while a
+    # household's rows are being cascade-deleted.
+    op.create_table(
+        "household_stats",
+        sa.Column("household_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(20), primary_key=True),
+        sa.Column("key", sa.Text, primary_key=True),
+        sa.Column("count", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        sa.Column("bytes", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        schema="twoof",
+    )
+
+    # Increments upsert; decrements only ever touch existing rows and drop
+    # them once they reach zero.
+    op.execute("""
+        CREATE FUNCTION twoof.bump_household_stat(
+            hid uuid, stat_kind text, stat_key text, d_count bigint, d_bytes bigint
+        ) RETURNS void LANGUAGE plpgsql AS $$
+        BEGIN
+            IF d_count >= 0 AND d_bytes >= 0 THEN
+                INSERT INTO twoof.household_stats AS s (household_id, kind, key, count, bytes)
+                VALUES (hid, stat_kind, stat_key, d_count, d_bytes)
+                ON CONFLICT (household_id, kind, key)
+                DO UPDATE SET count = s.count + EXCLUDED.count, bytes = s.bytes + EXCLUDED.bytes;
+            ELSE
+                UPDATE twoof.household_stats
+                   SET count = count + d_count, bytes = bytes + d_bytes
+                 WHERE household_id = hid AND kind = stat_kind AND key = stat_key;
+                DELETE FROM twoof.household_stats
+                 WHERE household_id = hid AND kind = stat_kind AND key = stat_key AND count <= 0;
+            END IF;
+        END $$
+    """)
+
+    op.execute("""
+        CREATE FUNCTION twoof.memories_stats_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE t text;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM twoof.bump_household_stat(OLD.household_id, 'month', to_char(OLD.memory_date, 'YYYY-MM'), -1, 0);
+                IF OLD.mood IS NOT NULL THEN
+                    PERFORM twoof.bump_household_stat(OLD.household_id, 'mood', OLD.mood, -1, 0);
+                END IF;
+                FOR t IN SELECT DISTINCT unnest(coalesce(OLD.tags, '{}')) LOOP
+                    PERFORM twoof.bump_household_stat(OLD.household_id, 'tag', t, -1, 0);
+                END LOOP;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM twoof.bump_household_stat(NEW.household_id, 'month', to_char(NEW.memory_date, 'YYYY-MM'), 1, 0);
+                IF NEW.mood IS NOT NULL THEN
+                    PERFORM twoof.bump_household_stat(NEW.household_id, 'mood', NEW.mood, 1, 0);
+                END IF;
+                FOR t IN SELECT DISTINCT unnest(coalesce(NEW.tags, '{}')) LOOP
+                    PERFORM twoof.bump_household_stat(NEW.household_id, 'tag', t, 1, 0);
+                END LOOP;
+            END IF;
+            RETURN NULL;
+        END $$
+    """)
+    op.execute("""
+        CREATE TRIGGER memories_stats
+        AFTER INSERT OR DELETE OR UPDATE OF household_id, memory_date, mood, tags ON twoof.memories
+        FOR EACH ROW EXECUTE FUNCTION twoof.memories_stats_trigger()
+    """)
+
+    # A memory takes its photos' totals with it before the cascade runs; the
+    # cascaded photo deletes then no longer find their memory and skip.
+    op.execute("""
+        CREATE FUNCTION twoof.memories_photo_stats_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE n bigint; b bigint;
+        BEGIN
+            SELECT count(*), coalesce(sum(size_bytes), 0) INTO n, b
+              FROM twoof.photos WHERE memory_id = OLD.id;
+            IF n > 0 THEN
+                PERFORM twoof.bump_household_stat(OLD.household_id, 'photos', '', -n, -b);
+            END IF;
+            RETURN OLD;
+        END $$
+    """)
+    op.execute("""
+        CREATE TRIGGER memories_photo_stats
+        BEFORE DELETE ON twoof.memories
+        FOR EACH ROW EXECUTE FUNCTION twoof.memories_photo_stats_trigger()
+    """)
+
+    op.execute("""
+        CREATE FUNCTION twoof.photos_stats_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE hid uuid;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT household_id INTO hid FROM twoof.memories WHERE id = NEW.memory_id;
+                PERFORM twoof.bump_household_stat(hid, 'photos', '', 1, NEW.size_bytes);
+            ELSE
+                SELECT household_id INTO hid FROM twoof.memories WHERE id = OLD.memory_id;
+                IF hid IS NOT NULL THEN
+                    PERFORM twoof.bump_household_stat(hid, 'photos', '', -1, -OLD.size_bytes);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END $$
+    """)
+    op.execute("""
+        CREATE TRIGGER photos_stats
+        AFTER INSERT OR DELETE ON twoof.photos
+        FOR EACH ROW EXECUTE FUNCTION twoof.photos_stats_trigger()
+    """)
+
+    # Backfill from existing rows
+    op.execute("""
+        INSERT INTO twoof.household_stats (household_id, kind, key, count)
+        SELECT household_id, 'month', to_char(memory_date, 'YYYY-MM'), count(*)
+          FROM twoof.memories GROUP BY 1, 3
+        UNION ALL
+        SELECT household_id, 'mood', mood, count(*)
+          FROM twoof.memories WHERE mood IS NOT NULL GROUP BY 1, 3
+        UNION ALL
+        SELECT household_id, 'tag', tag, count(DISTINCT id)
+          FROM twoof.memories, unnest(tags) AS tag GROUP BY 1, 3
+    """)
+    op.execute("""
+        INSERT INTO twoof.household_stats (household_id, kind, key, count, bytes)
+        SELECT m.household_id, 'photos', '', count(*), sum(p.size_bytes)
+          FROM twoof.photos p JOIN twoof.memories m ON m.id = p.memory_id
+         GROUP BY m.household_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS photos_stats ON twoof.photos")
+    op.execute("DROP TRIGGER IF EXISTS memories_photo_stats ON twoof.memories")
+    op.execute("DROP TRIGGER IF EXISTS memories_stats ON twoof.memories")
+    op.execute("DROP FUNCTION IF EXISTS twoof.photos_stats_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS twoof.memories_photo_stats_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS twoof.memories_stats_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS twoof.bump_household_stat(uuid, text, text, bigint, bigint)")
+    op.drop_table("household_stats", schema="twoof")
@@ -0,0 +1,29 @@
+"""Composite (household_id, memory_date) index for date-range filters
+
+Replaces the single-column household and date indexes, neither of which
+can serve a per-household date range on its own.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_memories_household_date", "memories", ["household_id", "memory_date"], schema="twoof",
+    )
+    op.drop_index("idx_memories_household", table_name="memories", schema="twoof")
+    op.drop_index("idx_memories_date", table_name="memories", schema="twoof")
+
+
+def downgrade() -> None:
+    op.create_index("idx_memories_date", "memories", ["memory_date"], schema="twoof")
+    op.create_index("idx_memories_household", "memories", ["household_id"], schema="twoof")
+    op.drop_index("idx_memories_household_date", table_name="memories", schema="twoof")
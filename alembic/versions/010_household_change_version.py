@@ -0,0 +1,25 @@
+"""Per-household change version for list ETags
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "households",
+        sa.Column("change_version", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        schema="twoof",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("households", "change_version", schema="twoof")
@@ -0,0 +1,30 @@
+"""Per-household change log behind the /api/events stream
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+revision = "011"
+down_revision = "010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per change version; the primary key serves Last-Event-ID replay.
+    op.create_table(
+        "household_events",
+        sa.Column("household_id", UUID(as_uuid=True), sa.ForeignKey("twoof.households.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("version", sa.BigInteger, primary_key=True),
+        sa.Column("changes", JSONB, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        schema="twoof",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("household_events", schema="twoof")
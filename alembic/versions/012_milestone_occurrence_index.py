@@ -0,0 +1,22 @@
+"""Index milestones by next occurrence across households for the reminder scan
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "012"
+down_revision = "011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # idx_milestones_next leads with household_id; the daily scan ranges over
+    # next_occurrence for every household at once.
+    op.create_index("idx_milestones_occurrence", "milestones", ["next_occurrence"], schema="twoof")
+
+
+def downgrade() -> None:
+    op.drop_index("idx_milestones_occurrence", table_name="milestones", schema="twoof")
@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+from twoof_api.config import settings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="TwoOf API benchmark harness")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="fill the database with synthetic households")
+    seed.add_argument("--reset", action="store_true", help="drop the twoof schema and photo files first")
+    seed.add_argument("--households", type=int, default=20)
+    seed.add_argument("--memories", type=int, default=300, help="per household")
+    seed.add_argument("--photos-per-memory", type=int, default=2, help="average; 0 for no photos")
+    seed.add_argument("--distinct-photos", type=int, default=100, help="image files shared by all photos")
+    seed.add_argument("--ideas", type=int, default=40, help="per household")
+    seed.add_argument("--milestones", type=int, default=15, help="per household")
+    seed.add_argument("--seed", type=int, default=1)
+
+    run = commands.add_parser("run", help="load the app and report latency per endpoint")
+    run.add_argument("--scenarios", default="list_memories,serve_photo,search_memories,export_data",
+                     help="comma-separated; 'all' for every scenario")
+    run.add_argument("--requests", type=int, default=1000, help="per scenario")
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--warmup", type=int, default=50, help="unmeasured requests per scenario")
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--save", type=Path, help="write the results as a JSON baseline")
+    run.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    run.add_argument("--tolerance", type=float, default=0.15,
+                     help="allowed p95/throughput regression against --compare (fraction)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        from .seed import Scale, reset, seed as seed_households
+        from twoof_api.database import engine
+
+        async def go():
+            try:
+                if args.reset:
+                    await reset()
+                await seed_households(Scale(
+                    households=args.households,
+                    memories=args.memories,
+                    photos_per_memory=args.photos_per_memory,
+                    distinct_photos=args.distinct_photos,
+                    ideas=args.ideas,
+                    milestones=args.milestones,
+                    seed=args.seed,
+                ))
+            finally:
+                await engine.dispose()
+
+        asyncio.run(go())
+        return 0
+
+    from .load import SCENARIOS, print_report, regressions, run as run_load
+
+    scenarios = list(SCENARIOS) if args.scenarios == "all" else args.scenarios.split(",")
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    report = asyncio.run(run_load(scenarios, args.requests, args.concurrency, args.warmup, args.seed))
+    report["meta"]["db_pool_size"] = settings.db_pool_size
+    report["meta"]["db_max_overflow"] = settings.db_max_overflow
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    failing = [name for name, r in report["results"].items() if r["errors"]]
+    if failing:
+        print(f"Requests failed in: {', '.join(failing)}; not saving or comparing", file=sys.stderr)
+        return 1
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+    if baseline:
+        failed = regressions(report, baseline, args.tolerance)
+        if failed:
+            print(f"Regressed beyond {args.tolerance:.0%}: {', '.join(failed)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.log_level.upper(), format="%(message)s")
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""Drive the ASGI app with concurrent clients and report latency per endpoint."""
+import asyncio
+import json
+import logging
+import random
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+from fastapi import Request
+from sqlalchemy import Integer, func, select
+from shelf_auth_middleware import get_current_user
+
+from twoof_api.database import engine
+from twoof_api.main import app
+from twoof_api.models import Household, Memory, Photo
+
+from .seed import REPO_ROOT, WORDS
+
+logger = logging.getLogger("twoof.bench")
+
+BENCH_USER_HEADER = "X-Bench-User"
+PHOTOS_PER_HOUSEHOLD = 50
+
+
+@dataclass(frozen=True)
+class BenchUser:
+    """Stands in for ShelfUser; the routes only read `id`."""
+
+    id: str
+
+
+async def bench_user(request: Request) -> BenchUser:
+    return BenchUser(id=request.headers[BENCH_USER_HEADER])
+
+
+@dataclass
+class Target:
+    user_id: str
+    photo_ids: list[str]
+    years: list[int]
+
+
+Scenario = Callable[[random.Random, Target], str]
+
+SCENARIOS: dict[str, Scenario] = {
+    "list_memories": lambda rng, t: "/api/memories?per_page=20",
+    "list_memories_year": lambda rng, t: f"/api/memories?per_page=20&year={rng.choice(t.years)}",
+    "list_memory_cards": lambda rng, t: "/api/memories?per_page=20&view=card",
+    "list_date_ideas": lambda rng, t: "/api/dates",
+    "list_milestones": lambda rng, t: "/api/milestones",
+    "search_memories": lambda rng, t: f"/api/search?q={rng.choice(WORDS)}",
+    "serve_photo": lambda rng, t: f"/api/photos/{rng.choice(t.photo_ids)}/file",
+    "serve_photo_thumb": lambda rng, t: f"/api/photos/{rng.choice(t.photo_ids)}/file?size=thumb",
+    "overview": lambda rng, t: "/api/overview",
+    "export_data": lambda rng, t: "/api/export",
+}
+PHOTO_SCENARIOS = {"serve_photo", "serve_photo_thumb"}
+
+
+@dataclass
+class Result:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    bytes: int = 0
+    wall_seconds: float = 0.0
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies)
+        cuts = statistics.quantiles(lat, n=100, method="inclusive") if len(lat) > 1 else lat * 99
+        return {
+            "requests": len(lat),
+            "errors": self.errors,
+            "rps": round(len(lat) / self.wall_seconds, 1) if self.wall_seconds else 0.0,
+            "mean_ms": round(statistics.fmean(lat) * 1000, 2) if lat else 0.0,
+            "p50_ms": round(cuts[49] * 1000, 2) if lat else 0.0,
+            "p95_ms": round(cuts[94] * 1000, 2) if lat else 0.0,
+            "p99_ms": round(cuts[98] * 1000, 2) if lat else 0.0,
+            "mb_per_s": round(self.bytes / self.wall_seconds / 1e6, 2) if self.wall_seconds else 0.0,
+        }
+
+
+async def load_targets() -> list[Target]:
+    """Seeded households, with a sample of each one's photos and memory years."""
+    year = func.extract("year", Memory.memory_date).cast(Integer)
+    ranked = (
+        select(
+            Memory.household_id,
+            Photo.id,
+            func.row_number().over(partition_by=Memory.household_id, order_by=Photo.id).label("n"),
+        )
+        .join(Memory, Memory.id == Photo.memory_id)
+        .subquery()
+    )
+    async with engine.connect() as conn:
+        households = (await conn.execute(select(Household.id, Household.user_a_id).order_by(Household.name))).all()
+        years = (await conn.execute(select(Memory.household_id, year).group_by(Memory.household_id, year))).all()
+        photos = (
+            await conn.execute(
+                select(ranked.c.household_id, ranked.c.id).where(ranked.c.n <= PHOTOS_PER_HOUSEHOLD)
+            )
+        ).all()
+
+    targets = {hid: Target(user_id=str(user_id), photo_ids=[], years=[]) for hid, user_id in households}
+    for hid, y in years:
+        targets[hid].years.append(y)
+    for hid, photo_id in photos:
+        targets[hid].photo_ids.append(str(photo_id))
+    return [t for t in targets.values() if t.years]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    targets: list[Target],
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> Result:
+    result = Result()
+    remaining = requests
+
+    async def worker(n: int):
+        nonlocal remaining
+        rng = random.Random(seed * 1000 + n)
+        while remaining > 0:
+            remaining -= 1
+            target = rng.choice(targets)
+            url = scenario(rng, target)
+            start = time.perf_counter()
+            response = await client.get(url, headers={BENCH_USER_HEADER: target.user_id})
+            result.latencies.append(time.perf_counter() - start)
+            result.bytes += len(response.content)
+            if response.status_code >= 400 or not _complete(response):
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    result.wall_seconds = time.perf_counter() - start
+    return result
+
+
+def _complete(response: httpx.Response) -> bool:
+    """False for a JSON body cut short, e.g. a stream that failed after its headers."""
+    if not response.headers.get("content-type", "").startswith("application/json"):
+        return True
+    try:
+        json.loads(response.content)
+    except ValueError:
+        return False
+    return True
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+async def run(
+    scenarios: list[str],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int,
+) -> dict:
+    targets = await load_targets()
+    if not targets:
+        raise SystemExit("No seeded households found; run `python -m bench seed` first")
+    if any(name in PHOTO_SCENARIOS for name in scenarios) and not any(t.photo_ids for t in targets):
+        raise SystemExit("Photo scenarios need a seed with --photos-per-memory > 0")
+
+    app.dependency_overrides[get_current_user] = bench_user
+    results = {}
+    # A failing endpoint should show up as errors in the report, not abort the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in scenarios:
+            pool = [t for t in targets if t.photo_ids] if name in PHOTO_SCENARIOS else targets
+            if warmup:
+                await run_scenario(client, SCENARIOS[name], pool, warmup, concurrency, seed - 1)
+            summary = (await run_scenario(client, SCENARIOS[name], pool, requests, concurrency, seed)).summary()
+            results[name] = summary
+            logger.info(f"{name}: {json.dumps(summary)}")
+    await engine.dispose()
+
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "households": len(targets),
+            "requests": requests,
+            "concurrency": concurrency,
+            "warmup": warmup,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict, baseline: dict | None = None) -> None:
+    """Print a results table, with changes against `baseline` when given."""
+    base = (baseline or {}).get("results", {})
+    print(f"{'scenario':<20} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, r in report["results"].items():
+        line = f"{name:<20} {r['rps']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9} {r['errors']:>7}"
+        if name in base:
+            b = base[name]
+            deltas = [
+                f"{key.split('_')[0]} {_delta(r[key], b[key])}"
+                for key in ("rps", "p50_ms", "p95_ms", "p99_ms")
+            ]
+            line += "   vs baseline: " + ", ".join(deltas)
+        print(line)
+
+
+def _delta(current: float, base: float) -> str:
+    if not base:
+        return "n/a"
+    return f"{(current - base) / base * 100:+.1f}%"
+
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Scenarios whose p95 grew, or throughput fell, by more than `tolerance`."""
+    failed = []
+    for name, r in report["results"].items():
+        b = baseline.get("results", {}).get(name)
+        if not b:
+            continue
+        if b["p95_ms"] and r["p95_ms"] > b["p95_ms"] * (1 + tolerance):
+            failed.append(name)
+        elif b["rps"] and r["rps"] < b["rps"] * (1 - tolerance):
+            failed.append(name)
+    return failed
@@ -0,0 +1,185 @@
+"""Fill the configured database and data directory with synthetic households."""
+import asyncio
+import io
+import hashlib
+import logging
+import random
+import shutil
+import subprocess
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from PIL import Image
+from sqlalchemy import insert, text
+
+from twoof_api.config import settings
+from twoof_api.database import engine
+from twoof_api.models import DateIdea, Household, Memory, Milestone, Photo, PhotoBlob
+from twoof_api.routes.milestones import scheduled_occurrence
+from twoof_api.storage import blob_path
+
+logger = logging.getLogger("twoof.bench")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BATCH_SIZE = 1000
+NAMESPACE = uuid.UUID("6f1d3c1e-2b7a-4c55-9d0e-8a4c2f3b7e10")
+
+# Search queries in the load run are drawn from this vocabulary too.
+WORDS = (
+    "beach sunset coffee hike mountain picnic concert museum dinner breakfast "
+    "rain snow garden market train airport road trip lake forest city bridge "
+    "birthday wedding holiday festival movie bookstore bakery pizza sushi "
+    "campfire stars river island castle gallery park bicycle kayak vineyard"
+).split()
+TAGS = ("travel", "food", "family", "friends", "home", "firsts", "outdoors", "music")
+MOODS = ("happy", "grateful", "excited", "calm", "silly", "nostalgic")
+CATEGORIES = ("outdoors", "food", "culture", "staycation", "adventure")
+
+
+@dataclass(frozen=True)
+class Scale:
+    households: int
+    memories: int
+    photos_per_memory: int
+    distinct_photos: int
+    ideas: int
+    milestones: int
+    seed: int
+
+
+def household_user(i: int) -> uuid.UUID:
+    """Stable user id of household i's first partner; the load run signs in as it."""
+    return uuid.uuid5(NAMESPACE, f"user-a-{i}")
+
+
+def _words(rng: random.Random, lo: int, hi: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(lo, hi)))
+
+
+def _render_photo(rng: random.Random) -> bytes:
+    # Noise compresses like a real photo, so file sizes are realistic.
+    width, height = rng.choice(((1600, 1200), (1200, 1600), (2048, 1536)))
+    img = Image.effect_noise((width, height), rng.randint(32, 96)).convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+def write_photos(rng: random.Random, count: int) -> list[tuple[str, str, int]]:
+    """Write `count` distinct JPEGs to their blob paths; returns (hash, path, size)."""
+    blobs = []
+    data_dir = Path(settings.data_dir)
+    for _ in range(count):
+        content = _render_photo(rng)
+        content_hash = hashlib.sha256(content).hexdigest()
+        path = blob_path(content_hash, ".jpg")
+        dest = data_dir / path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(content)
+        blobs.append((content_hash, path, len(content)))
+    return blobs
+
+
+async def reset() -> None:
+    """Drop the twoof schema and photo files, then migrate from scratch."""
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA IF EXISTS twoof CASCADE"))
+    shutil.rmtree(Path(settings.data_dir) / "photos", ignore_errors=True)
+    subprocess.run(["alembic", "upgrade", "head"], cwd=REPO_ROOT, check=True)
+
+
+async def _insert(conn, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        await conn.execute(insert(model.__table__).values(rows[start:start + BATCH_SIZE]))
+
+
+async def seed(scale: Scale) -> None:
+    rng = random.Random(scale.seed)
+    blobs = await asyncio.to_thread(write_photos, rng, scale.distinct_photos) if scale.photos_per_memory else []
+    refs = {h: 0 for h, _, _ in blobs}
+    today = date.today()
+    now = datetime.now(timezone.utc)
+
+    for i in range(scale.households):
+        household_id = uuid.uuid5(NAMESPACE, f"household-{i}")
+        user_a, user_b = household_user(i), uuid.uuid5(NAMESPACE, f"user-b-{i}")
+        memories, photos, ideas, milestones = [], [], [], []
+
+        for _ in range(scale.memories):
+            memory_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            memories.append({
+                "id": memory_id,
+                "household_id": household_id,
+                "created_by": rng.choice((user_a, user_b)),
+                "title": _words(rng, 2, 6).capitalize(),
+                "content": _words(rng, 20, 120),
+                "memory_date": today - timedelta(days=rng.randint(0, 3650)),
+                "location": rng.choice(WORDS).capitalize() if rng.random() < 0.6 else None,
+                "mood": rng.choice(MOODS) if rng.random() < 0.7 else None,
+                "tags": rng.sample(TAGS, rng.randint(0, 3)),
+                "pinned": rng.random() < 0.02,
+                "created_at": now - timedelta(seconds=rng.randint(0, 10**8)),
+            })
+            for order in range(rng.randint(0, 2 * scale.photos_per_memory) if blobs else 0):
+                content_hash, path, size = rng.choice(blobs)
+                refs[content_hash] += 1
+                photos.append({
+                    "memory_id": memory_id,
+                    "file_path": path,
+                    "content_hash": content_hash,
+                    "filename": f"IMG_{rng.randint(1000, 9999)}.jpg",
+                    "mime_type": "image/jpeg",
+                    "size_bytes": size,
+                    "sort_order": order,
+                    "derivatives": {},
+                })
+
+        for _ in range(scale.ideas):
+            done = rng.random() < 0.3
+            ideas.append({
+                "household_id": household_id,
+                "created_by": rng.choice((user_a, user_b)),
+                "title": _words(rng, 2, 5).capitalize(),
+                "description": _words(rng, 5, 30),
+                "category": rng.choice(CATEGORIES),
+                "done": done,
+                "done_date": today - timedelta(days=rng.randint(0, 700)) if done else None,
+                "priority": rng.randint(0, 2),
+            })
+
+        for _ in range(scale.milestones):
+            milestone_date = today - timedelta(days=rng.randint(-200, 3650))
+            recurring = rng.random() < 0.5
+            milestones.append({
+                "household_id": household_id,
+                "title": _words(rng, 1, 4).capitalize(),
+                "milestone_date": milestone_date,
+                "recurring": recurring,
+                "next_occurrence": scheduled_occurrence(milestone_date, recurring),
+            })
+
+        async with engine.begin() as conn:
+            await conn.execute(insert(Household.__table__).values(
+                id=household_id,
+                name=f"Bench {i}",
+                invite_code=f"BENCH{i:06d}",
+                user_a_id=user_a,
+                user_b_id=user_b,
+                anniversary=today - timedelta(days=rng.randint(100, 5000)),
+            ))
+            await _insert(conn, Memory, memories)
+            await _insert(conn, Photo, photos)
+            await _insert(conn, DateIdea, ideas)
+            await _insert(conn, Milestone, milestones)
+        logger.info(f"household {i + 1}/{scale.households}: {len(memories)} memories, {len(photos)} photos")
+
+    used = [
+        {"content_hash": h, "file_path": path, "size_bytes": size, "ref_count": refs[h]}
+        for h, path, size in blobs
+        if refs[h]
+    ]
+    async with engine.begin() as conn:
+        await _insert(conn, PhotoBlob, used)
+        await conn.execute(text("ANALYZE"))
@@ -10,6 +10,7 @@ import DateIdeas from "./components/DateIdeas";
 import MilestoneList from "./components/MilestoneList";
 import SearchBar from "./components/SearchBar";
 import { useToast } from "./hooks/useToast";
+import { useHouseholdEvents } from "./hooks/useHouseholdEvents";
 import { ToastContainer } from "./components/Toast";
 
 type View =
@@ -28,6 +29,8 @@ export default function App() {
   const [loading, setLoading] = useState(true);
   const [view, setView] = useState<View>({ kind: "overview" });
   const { toasts, showToast } = useToast();
+  const sync = useHouseholdEvents(household !== null);
+  const memorySync = sync.memory + sync.photo;
 
   const loadHousehold = useCallback(async () => {
     try {
@@ -121,13 +124,18 @@ export default function App() {
         {/* Views */}
         <div className="animate-fadeIn">
           {view.kind === "overview" && (
-            <Overview household={household} onNavigate={navigateTab} />
+            <Overview
+              household={household}
+              onNavigate={navigateTab}
+              sync={memorySync + sync.date_idea + sync.milestone}
+            />
           )}
 
           {view.kind === "timeline" && (
             <Timeline
               onSelect={(m) => setView({ kind: "memory-detail", memoryId: m.id })}
               onAdd={() => setView({ kind: "add-memory" })}
+              sync={memorySync}
             />
           )}
 
@@ -137,6 +145,7 @@ export default function App() {
               onBack={() => setView({ kind: "timeline" })}
               onEdit={(m) => setView({ kind: "edit-memory", memory: m })}
               onDeleted={() => setView({ kind: "timeline" })}
+              sync={memorySync}
               showToast={showToast}
             />
           )}
@@ -159,9 +168,9 @@ export default function App() {
             />
           )}
 
-          {view.kind === "dates" && <DateIdeas showToast={showToast} />}
+          {view.kind === "dates" && <DateIdeas sync={sync.date_idea} showToast={showToast} />}
 
-          {view.kind === "milestones" && <MilestoneList showToast={showToast} />}
+          {view.kind === "milestones" && <MilestoneList sync={sync.milestone} showToast={showToast} />}
         </div>
       </div>
 
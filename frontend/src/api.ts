@@ -1,11 +1,19 @@
 import type {
+  BatchResult,
+  ChangeEvent,
+  DateIdeaBatchOp,
   Household,
+  ImportResult,
+  Overview,
   Memory,
+  MemoryBatchOp,
+  MemoryCardListResponse,
   MemoryListResponse,
   Photo,
   DateIdea,
   Milestone,
   SearchResult,
+  Stats,
 } from "./types";
 
 const BASE = "/api";
@@ -48,23 +56,44 @@ export const updateHousehold = (data: { name?: string; anniversary?: string }) =
 export const regenerateInvite = () =>
   request<Household>("/household/regenerate-invite", { method: "POST" });
 
+// Overview
+export const getOverview = () => request<Overview>("/overview");
+
 // Memories
-export const getMemories = (params?: {
+type MemoryListParams = {
   page?: number;
   per_page?: number;
+  cursor?: string;
   year?: number;
   month?: number;
+  from?: string;
+  to?: string;
   tag?: string;
   pinned?: boolean;
-}) => {
+  fields?: string[];
+};
+
+const memoryListQuery = (params?: MemoryListParams) => {
   const qs = new URLSearchParams();
   if (params?.page) qs.set("page", String(params.page));
   if (params?.per_page) qs.set("per_page", String(params.per_page));
+  if (params?.cursor) qs.set("cursor", params.cursor);
   if (params?.year) qs.set("year", String(params.year));
   if (params?.month) qs.set("month", String(params.month));
+  if (params?.from) qs.set("from", params.from);
+  if (params?.to) qs.set("to", params.to);
   if (params?.tag) qs.set("tag", params.tag);
   if (params?.pinned !== undefined) qs.set("pinned", String(params.pinned));
-  return request<MemoryListResponse>(`/memories?${qs}`);
+  if (params?.fields) qs.set("fields", params.fields.join(","));
+  return qs;
+};
+
+export const getMemories = (params?: MemoryListParams) =>
+  request<MemoryListResponse>(`/memories?${memoryListQuery(params)}`);
+export const getMemoryCards = (params?: MemoryListParams) => {
+  const qs = memoryListQuery(params);
+  qs.set("view", "card");
+  return request<MemoryCardListResponse>(`/memories?${qs}`);
 };
 export const getMemory = (id: string) => request<Memory>(`/memories/${id}`);
 export const createMemory = (data: {
@@ -84,6 +113,11 @@ export const updateMemory = (id: string, data: Record<string, unknown>) =>
   });
 export const deleteMemory = (id: string) =>
   request<void>(`/memories/${id}`, { method: "DELETE" });
+export const batchMemories = (ops: MemoryBatchOp[]) =>
+  request<BatchResult>("/memories/batch", {
+    method: "POST",
+    body: JSON.stringify({ ops }),
+  });
 
 // Photos
 export const uploadPhotos = async (memoryId: string, files: File[]): Promise<Photo[]> => {
@@ -106,18 +140,22 @@ export const uploadPhotos = async (memoryId: string, files: File[]): Promise<Pho
 };
 export const deletePhoto = (id: string) =>
   request<void>(`/photos/${id}`, { method: "DELETE" });
-export const photoUrl = (id: string) => `${BASE}/photos/${id}/file`;
+export type PhotoSize = "thumb" | "medium" | "full";
+export const photoUrl = (id: string, size: PhotoSize = "full") =>
+  size === "full" ? `${BASE}/photos/${id}/file` : `${BASE}/photos/${id}/file?size=${size}`;
 
 // Date Ideas
 export const getDateIdeas = (params?: {
   category?: string;
   done?: boolean;
   priority?: number;
+  fields?: string[];
 }) => {
   const qs = new URLSearchParams();
   if (params?.category) qs.set("category", params.category);
   if (params?.done !== undefined) qs.set("done", String(params.done));
   if (params?.priority !== undefined) qs.set("priority", String(params.priority));
+  if (params?.fields) qs.set("fields", params.fields.join(","));
   return request<DateIdea[]>(`/dates?${qs}`);
 };
 export const createDateIdea = (data: {
@@ -139,6 +177,11 @@ export const deleteDateIdea = (id: string) =>
   request<void>(`/dates/${id}`, { method: "DELETE" });
 export const toggleDateDone = (id: string) =>
   request<DateIdea>(`/dates/${id}/done`, { method: "PATCH" });
+export const batchDateIdeas = (ops: DateIdeaBatchOp[]) =>
+  request<BatchResult>("/dates/batch", {
+    method: "POST",
+    body: JSON.stringify({ ops }),
+  });
 
 // Milestones
 export const getMilestones = () => request<Milestone[]>("/milestones");
@@ -161,11 +204,44 @@ export const updateMilestone = (id: string, data: Record<string, unknown>) =>
 export const deleteMilestone = (id: string) =>
   request<void>(`/milestones/${id}`, { method: "DELETE" });
 
+// Stats
+export const getStats = () => request<Stats>("/stats");
+
 // Search
 export const search = (q: string) =>
   request<SearchResult[]>(`/search?q=${encodeURIComponent(q)}`);
 
+// Events
+// Live changes. `onChange` gets null when the stream reset and everything
+// should be reloaded. Returns a function that closes the stream.
+export const subscribeEvents = (onChange: (event: ChangeEvent | null) => void) => {
+  const source = new EventSource(`${BASE}/events`, { withCredentials: true });
+  source.addEventListener("change", (e) => onChange(JSON.parse((e as MessageEvent).data)));
+  source.addEventListener("reset", () => onChange(null));
+  return () => source.close();
+};
+
 // Export
-export const exportData = () => {
-  window.open(`${BASE}/export`, "_blank");
+export const exportData = (format: "json" | "zip" = "json") => {
+  window.open(`${BASE}/export?format=${format}`, "_blank");
+};
+
+// Import
+export const importData = async (file: File): Promise<ImportResult> => {
+  const form = new FormData();
+  form.append("file", file);
+  const res = await fetch(`${BASE}/import`, {
+    method: "POST",
+    credentials: "include",
+    body: form,
+  });
+  if (res.status === 401) {
+    window.location.href = "/login";
+    throw new Error("Session expired");
+  }
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({ detail: res.statusText }));
+    throw new Error(typeof err.detail === "string" ? err.detail : "Import failed");
+  }
+  return res.json();
 };
@@ -4,6 +4,7 @@ import * as api from "../api";
 import DateIdeaEditor from "./DateIdeaEditor";
 
 interface Props {
+  sync?: number;
   showToast?: (message: string, type?: "success" | "error") => void;
 }
 
@@ -24,7 +25,7 @@ const PRIORITY_LABELS: Record<number, string> = {
   3: "Must do!",
 };
 
-export default function DateIdeas({ showToast }: Props) {
+export default function DateIdeas({ sync, showToast }: Props) {
   const [ideas, setIdeas] = useState<DateIdea[]>([]);
   const [filter, setFilter] = useState<"all" | "todo" | "done">("todo");
   const [catFilter, setCatFilter] = useState("");
@@ -41,7 +42,7 @@ export default function DateIdeas({ showToast }: Props) {
 
   useEffect(() => {
     load();
-  }, [filter, catFilter]);
+  }, [filter, catFilter, sync]);
 
   const handleToggle = async (id: string) => {
     await api.toggleDateDone(id);
@@ -1,13 +1,13 @@
-import type { Memory } from "../types";
+import type { MemoryCard as MemoryCardData } from "../types";
 import * as api from "../api";
 
 interface Props {
-  memory: Memory;
+  memory: MemoryCardData;
   onClick: () => void;
 }
 
 export default function MemoryCard({ memory, onClick }: Props) {
-  const hasPhotos = memory.photos.length > 0;
+  const cover = memory.cover_photo;
 
   return (
     <button
@@ -15,17 +15,17 @@ export default function MemoryCard({ memory, onClick }: Props) {
       className="w-full text-left apple-card rounded-2xl shadow-md overflow-hidden group card-enter apple-button"
     >
       {/* Photo preview */}
-      {hasPhotos && (
+      {cover && (
         <div className="relative h-48 overflow-hidden">
           <img
-            src={api.photoUrl(memory.photos[0].id)}
+            src={api.photoUrl(cover.id, "medium")}
             alt=""
             className="w-full h-full object-cover group-hover:scale-[1.02] transition-transform duration-300"
             loading="lazy"
           />
-          {memory.photos.length > 1 && (
+          {memory.photo_count > 1 && (
             <span className="absolute bottom-2 right-2 text-xs bg-black/60 text-white px-2 py-0.5 rounded-full">
-              +{memory.photos.length - 1}
+              +{memory.photo_count - 1}
             </span>
           )}
           {memory.pinned && (
@@ -37,7 +37,7 @@ export default function MemoryCard({ memory, onClick }: Props) {
       )}
 
       <div className="p-4">
-        {!hasPhotos && memory.pinned && (
+        {!cover && memory.pinned && (
           <span className="text-xs bg-rose-50 dark:bg-rose-900/20 text-rose-600 dark:text-rose-400 px-2 py-0.5 rounded-full mb-2 inline-block">
             Pinned
           </span>
@@ -61,9 +61,10 @@ export default function MemoryCard({ memory, onClick }: Props) {
           </div>
         </div>
 
-        {memory.content && (
+        {memory.excerpt && (
           <p className="text-sm text-slate-500 dark:text-slate-400 mt-2 line-clamp-2 leading-relaxed">
-            {memory.content}
+            {memory.excerpt}
+            {memory.has_more && "…"}
           </p>
         )}
 
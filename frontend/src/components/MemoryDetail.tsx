@@ -8,15 +8,16 @@ interface Props {
   onBack: () => void;
   onEdit: (m: Memory) => void;
   onDeleted: () => void;
+  sync?: number;
   showToast?: (message: string, type?: "success" | "error") => void;
 }
 
-export default function MemoryDetail({ memoryId, onBack, onEdit, onDeleted, showToast }: Props) {
+export default function MemoryDetail({ memoryId, onBack, onEdit, onDeleted, sync, showToast }: Props) {
   const [memory, setMemory] = useState<Memory | null>(null);
 
   useEffect(() => {
     api.getMemory(memoryId).then(setMemory).catch(() => {});
-  }, [memoryId]);
+  }, [memoryId, sync]);
 
   if (!memory) {
     return (
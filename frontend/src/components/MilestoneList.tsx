@@ -4,10 +4,11 @@ import * as api from "../api";
 import MilestoneEditor from "./MilestoneEditor";
 
 interface Props {
+  sync?: number;
   showToast?: (message: string, type?: "success" | "error") => void;
 }
 
-export default function MilestoneList({ showToast }: Props) {
+export default function MilestoneList({ sync, showToast }: Props) {
   const [milestones, setMilestones] = useState<Milestone[]>([]);
   const [showEditor, setShowEditor] = useState(false);
   const [editMilestone, setEditMilestone] = useState<Milestone | null>(null);
@@ -18,7 +19,7 @@ export default function MilestoneList({ showToast }: Props) {
 
   useEffect(() => {
     load();
-  }, []);
+  }, [sync]);
 
   const handleDelete = async (id: string) => {
     if (!confirm("Delete this milestone?")) return;
@@ -1,26 +1,24 @@
 import { useState, useEffect } from "react";
-import type { Household, Milestone, Memory } from "../types";
+import type { Household, Overview as OverviewData } from "../types";
 import * as api from "../api";
 
 interface Props {
   household: Household;
   onNavigate: (tab: string) => void;
+  sync?: number;
 }
 
-export default function Overview({ household, onNavigate }: Props) {
-  const [memoryCount, setMemoryCount] = useState(0);
-  const [milestones, setMilestones] = useState<Milestone[]>([]);
-  const [recent, setRecent] = useState<Memory[]>([]);
+export default function Overview({ household, onNavigate, sync }: Props) {
+  const [overview, setOverview] = useState<OverviewData | null>(null);
 
   useEffect(() => {
-    api.getMemories({ per_page: 3 }).then((r) => {
-      setMemoryCount(r.total);
-      setRecent(r.memories);
-    }).catch(() => {});
-    api.getMilestones().then(setMilestones).catch(() => {});
-  }, []);
+    api.getOverview().then(setOverview).catch(() => {});
+  }, [sync]);
 
-  const upcoming = milestones.filter((m) => m.days_until != null && m.days_until >= 0).slice(0, 3);
+  const memoryCount = overview?.totals.memories ?? 0;
+  const milestoneCount = overview?.totals.milestones ?? 0;
+  const upcoming = overview?.upcoming_milestones ?? [];
+  const recent = overview?.recent_memories ?? [];
 
   // Days together
   let daysTogether: number | null = null;
@@ -71,7 +69,7 @@ export default function Overview({ household, onNavigate }: Props) {
           onClick={() => onNavigate("milestones")}
           className="apple-card rounded-2xl shadow-md p-5 text-left card-enter apple-button"
         >
-          <span className="text-3xl font-bold text-gray-800 dark:text-gray-100 tabular-nums">{milestones.length}</span>
+          <span className="text-3xl font-bold text-gray-800 dark:text-gray-100 tabular-nums">{milestoneCount}</span>
           <p className="text-sm text-slate-500 dark:text-slate-400 mt-1">milestones tracked</p>
         </button>
       </div>
@@ -114,9 +112,9 @@ export default function Overview({ household, onNavigate }: Props) {
           <div className="space-y-2">
             {recent.map((m) => (
               <div key={m.id} className="flex items-center gap-3">
-                {m.photos.length > 0 ? (
+                {m.cover_photo ? (
                   <img
-                    src={api.photoUrl(m.photos[0].id)}
+                    src={api.photoUrl(m.cover_photo.id, "thumb")}
                     alt=""
                     className="w-10 h-10 rounded-lg object-cover"
                   />
@@ -18,7 +18,7 @@ export default function PhotoGallery({ photos, onDelete }: Props) {
       {photos.map((p) => (
         <div key={p.id} className="relative group rounded-xl overflow-hidden bg-slate-100 dark:bg-slate-800 shadow-sm">
           <img
-            src={api.photoUrl(p.id)}
+            src={api.photoUrl(p.id, "medium")}
             alt={p.filename}
             className="w-full h-48 object-cover"
             loading="lazy"
@@ -1,40 +1,92 @@
-import { useState, useEffect } from "react";
-import type { Memory } from "../types";
+import { useState, useEffect, useRef } from "react";
+import type { MemoryCard as MemoryCardData, StatCount } from "../types";
 import * as api from "../api";
 import MemoryCard from "./MemoryCard";
 
 interface Props {
-  onSelect: (memory: Memory) => void;
+  onSelect: (memory: MemoryCardData) => void;
   onAdd: () => void;
+  sync?: number;
 }
 
-export default function Timeline({ onSelect, onAdd }: Props) {
-  const [memories, setMemories] = useState<Memory[]>([]);
+export default function Timeline({ onSelect, onAdd, sync }: Props) {
+  const [memories, setMemories] = useState<MemoryCardData[]>([]);
   const [total, setTotal] = useState(0);
-  const [page, setPage] = useState(1);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [perPage] = useState(12);
   const [filterYear, setFilterYear] = useState<string>("");
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [years, setYears] = useState<StatCount[]>([]);
+  const loaded = useRef(0);
+  loaded.current = memories.length;
+
+  // Refetched on sync too, so a memory in a new year shows up in the filter
+  useEffect(() => {
+    api.getStats().then((s) => setYears(s.years)).catch(() => {});
+  }, [sync]);
 
   useEffect(() => {
     setLoading(true);
     api
-      .getMemories({
-        page,
+      .getMemoryCards({
         per_page: perPage,
         year: filterYear ? Number(filterYear) : undefined,
       })
       .then((res) => {
         setMemories(res.memories);
-        setTotal(res.total);
+        setTotal(res.total ?? 0);
+        setNextCursor(res.next_cursor);
       })
       .catch(() => {})
       .finally(() => setLoading(false));
-  }, [page, perPage, filterYear]);
+  }, [perPage, filterYear]);
 
-  const totalPages = Math.max(1, Math.ceil(total / perPage));
-  const currentYear = new Date().getFullYear();
-  const years = Array.from({ length: 10 }, (_, i) => currentYear - i);
+  // On a household change, refetch the pages already loaded rather than
+  // dropping back to the first one
+  useEffect(() => {
+    if (!sync) return;
+    let cancelled = false;
+    const refresh = async () => {
+      const wanted = Math.max(loaded.current, perPage);
+      const year = filterYear ? Number(filterYear) : undefined;
+      let rows: MemoryCardData[] = [];
+      let cursor: string | undefined;
+      let count = 0;
+      do {
+        const res = await api.getMemoryCards({ per_page: perPage, cursor, year });
+        rows = [...rows, ...res.memories];
+        cursor = res.next_cursor ?? undefined;
+        // Only the first page carries the total
+        count = res.total ?? count;
+      } while (cursor && rows.length < wanted);
+      if (cancelled) return;
+      setMemories(rows);
+      setTotal(count);
+      setNextCursor(cursor ?? null);
+    };
+    refresh().catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [sync]);
+
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    api
+      .getMemoryCards({
+        per_page: perPage,
+        cursor: nextCursor,
+        year: filterYear ? Number(filterYear) : undefined,
+      })
+      .then((res) => {
+        setMemories((prev) => [...prev, ...res.memories]);
+        setNextCursor(res.next_cursor);
+      })
+      .catch(() => {})
+      .finally(() => setLoadingMore(false));
+  };
 
   return (
     <div className="animate-fadeIn">
@@ -43,15 +95,12 @@ export default function Timeline({ onSelect, onAdd }: Props) {
           <h2 className="text-lg font-bold text-gray-800 dark:text-gray-100">Timeline</h2>
           <select
             value={filterYear}
-            onChange={(e) => {
-              setFilterYear(e.target.value);
-              setPage(1);
-            }}
+            onChange={(e) => setFilterYear(e.target.value)}
             className="modern-input rounded-full px-4 py-2 text-sm"
           >
             <option value="">All time</option>
             {years.map((y) => (
-              <option key={y} value={y}>{y}</option>
+              <option key={y.key} value={y.key}>{y.key} ({y.count})</option>
             ))}
           </select>
         </div>
@@ -82,25 +131,18 @@ export default function Timeline({ onSelect, onAdd }: Props) {
             ))}
           </div>
 
-          {totalPages > 1 && (
+          {nextCursor && (
             <div className="flex items-center justify-center gap-3 mt-6">
               <button
-                onClick={() => setPage((p) => Math.max(1, p - 1))}
-                disabled={page <= 1}
+                onClick={loadMore}
+                disabled={loadingMore}
                 className="apple-card rounded-xl px-4 py-2.5 text-sm font-medium text-slate-600 dark:text-slate-300 apple-button shadow-sm disabled:opacity-30"
               >
-                Prev
+                {loadingMore ? "Loading..." : "Load more"}
               </button>
               <span className="text-sm text-slate-500 dark:text-slate-400 tabular-nums">
-                {page} / {totalPages}
+                {memories.length} / {total}
               </span>
-              <button
-                onClick={() => setPage((p) => Math.min(totalPages, p + 1))}
-                disabled={page >= totalPages}
-                className="apple-card rounded-xl px-4 py-2.5 text-sm font-medium text-slate-600 dark:text-slate-300 apple-button shadow-sm disabled:opacity-30"
-              >
-                Next
-              </button>
             </div>
           )}
         </>
@@ -0,0 +1,31 @@
+import { useState, useEffect } from "react";
+import type { HouseholdChange } from "../types";
+import * as api from "../api";
+
+export type SyncCounters = Record<HouseholdChange["entity"], number>;
+
+const initial: SyncCounters = { memory: 0, photo: 0, date_idea: 0, milestone: 0, household: 0 };
+
+// A counter per entity type, bumped on every committed change to it,
+// including this tab's own writes; views add theirs to their effect deps
+// to refetch.
+export function useHouseholdEvents(enabled: boolean) {
+  const [sync, setSync] = useState<SyncCounters>(initial);
+
+  useEffect(() => {
+    if (!enabled) return;
+    return api.subscribeEvents((event) => {
+      setSync((prev) => {
+        const next = { ...prev };
+        // A reset, import or household change may touch anything
+        const all = !event || event.changes.some((c) => c.entity === "household");
+        for (const key of Object.keys(next) as (keyof SyncCounters)[]) {
+          if (all || event.changes.some((c) => c.entity === key)) next[key] += 1;
+        }
+        return next;
+      });
+    });
+  }, [enabled]);
+
+  return sync;
+}
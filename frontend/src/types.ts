@@ -33,9 +33,34 @@ export interface Memory {
 
 export interface MemoryListResponse {
   memories: Memory[];
-  total: number;
+  total: number | null;
   page: number;
   per_page: number;
+  next_cursor: string | null;
+}
+
+export interface MemoryCard {
+  id: string;
+  created_by: string;
+  title: string;
+  excerpt: string | null;
+  has_more: boolean;
+  memory_date: string;
+  location: string | null;
+  mood: string | null;
+  tags: string[];
+  pinned: boolean;
+  photo_count: number;
+  cover_photo: Photo | null;
+  created_at: string;
+}
+
+export interface MemoryCardListResponse {
+  memories: MemoryCard[];
+  total: number | null;
+  page: number;
+  per_page: number;
+  next_cursor: string | null;
 }
 
 export interface DateIdea {
@@ -71,3 +96,81 @@ export interface SearchResult {
   memory_date: string;
   location: string | null;
 }
+
+export interface ImportResult {
+  memories: number;
+  photos: number;
+  date_ideas: number;
+  milestones: number;
+}
+
+export interface OverviewMemory {
+  id: string;
+  title: string;
+  memory_date: string;
+  mood: string | null;
+  pinned: boolean;
+  photo_count: number;
+  cover_photo: Photo | null;
+}
+
+export interface Overview {
+  recent_memories: OverviewMemory[];
+  upcoming_milestones: Milestone[];
+  open_date_ideas_by_priority: Record<string, number>;
+  totals: {
+    memories: number;
+    photos: number;
+    milestones: number;
+    date_ideas_open: number;
+    date_ideas_done: number;
+  };
+}
+
+export interface StatCount {
+  key: string;
+  count: number;
+}
+
+export interface Stats {
+  memories: number;
+  photos: number;
+  photo_bytes: number;
+  years: StatCount[];
+  months: StatCount[];
+  tags: StatCount[];
+  moods: StatCount[];
+}
+
+export type MemoryBatchOp =
+  | { op: "create"; data: Partial<Memory> & { title: string; memory_date: string } }
+  | { op: "update"; id: string; data: Record<string, unknown> }
+  | { op: "delete"; id: string }
+  | { op: "pin"; id: string; pinned?: boolean }
+  | { op: "tag"; id: string; add?: string[]; remove?: string[] };
+
+export type DateIdeaBatchOp =
+  | { op: "create"; data: Partial<DateIdea> & { title: string } }
+  | { op: "update"; id: string; data: Record<string, unknown> }
+  | { op: "delete"; id: string }
+  | { op: "done"; id: string; done?: boolean };
+
+export interface BatchResult {
+  results: {
+    index: number;
+    op: string;
+    id: string | null;
+    status: "ok" | "not_found";
+  }[];
+}
+
+export interface HouseholdChange {
+  entity: "memory" | "photo" | "date_idea" | "milestone" | "household";
+  op: string;
+  ids?: string[]; // omitted when too many rows changed to list
+}
+
+export interface ChangeEvent {
+  version: number;
+  changes: HouseholdChange[];
+}
@@ -0,0 +1,68 @@
+"""The change hub catches streams up itself after its LISTEN connection drops."""
+import asyncio
+from uuid import UUID
+
+import pytest
+from sqlalchemy import text
+
+from twoof_api import events
+from twoof_api.changes import change_version
+from twoof_api.database import async_session, engine
+
+pytestmark = pytest.mark.anyio
+
+
+async def _write(client, title: str) -> None:
+    response = await client.post("/api/memories", json={"title": title, "memory_date": "2024-03-02"})
+    assert response.status_code == 201, response.text
+
+
+async def test_reconnect_fans_out_missed_events(client, monkeypatch):
+    monkeypatch.setattr(events, "RECONNECT_DELAY", 0.5)
+    reads = []
+    events_since = events.events_since
+
+    async def counted(household_id, version):
+        reads.append(version)
+        return await events_since(household_id, version)
+
+    monkeypatch.setattr(events, "events_since", counted)
+
+    household_id = UUID((await client.get("/api/household")).json()["id"])
+    hub = events.ChangeHub()
+    await hub.start()
+    try:
+        queues = [hub.subscribe(household_id) for _ in range(3)]
+        async with async_session() as session:
+            version = await change_version(household_id, session)
+        hub.track(household_id, version)
+
+        # Once the listener is up, a write reaches every stream
+        for _ in range(50):
+            await _write(client, "Before the blip")
+            try:
+                first = await asyncio.wait_for(queues[0].get(), 0.2)
+                break
+            except asyncio.TimeoutError:
+                continue
+        else:
+            pytest.fail("listener never delivered a change")
+        for queue in queues:
+            while not queue.empty():
+                assert queue.get_nowait() is not events.RESYNC
+
+        async with engine.connect() as conn:
+            await conn.execute(text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE query LIKE 'LISTEN%'"
+            ))
+        await _write(client, "During the blip")
+        reads.clear()
+
+        for queue in queues:
+            event = await asyncio.wait_for(queue.get(), 10)
+            assert event is not events.RESYNC
+            assert event.version > first.version
+        # One read for the household, not one per stream
+        assert len(reads) <= 2
+    finally:
+        await hub.stop()
@@ -0,0 +1,61 @@
+"""Imports stream the uploaded export section by section."""
+import io
+import json
+import zipfile
+
+import pytest
+from PIL import Image
+
+pytestmark = pytest.mark.anyio
+
+
+async def _seed(client) -> None:
+    buf = io.BytesIO()
+    Image.new("RGB", (16, 16), "navy").save(buf, "JPEG")
+    memory = (await client.post("/api/memories", json={"title": "Harbour", "memory_date": "2023-08-19"})).json()
+    response = await client.post(
+        f"/api/memories/{memory['id']}/photos",
+        files=[("files", ("boats.jpg", buf.getvalue(), "image/jpeg"))],
+    )
+    assert response.status_code == 201, response.text
+    await client.post("/api/dates", json={"title": "Cooking class"})
+    await client.post("/api/milestones", json={"title": "Moved in", "milestone_date": "2021-02-28", "recurring": True})
+
+
+async def test_zip_round_trip(client):
+    await _seed(client)
+    export = await client.get("/api/export?format=zip")
+    assert export.status_code == 200, export.text
+    # Sections in a different order than the exporter writes them
+    with zipfile.ZipFile(io.BytesIO(export.content)) as archive:
+        document = json.loads(archive.read("export.json"))
+        photos = {name: archive.read(name) for name in archive.namelist() if name != "export.json"}
+    reordered = {key: document[key] for key in ("milestones", "date_ideas", "memories", "household")}
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        archive.writestr("export.json", json.dumps(reordered))
+        for name, data in photos.items():
+            archive.writestr(name, data)
+
+    response = await client.post("/api/import", files={"file": ("export.zip", buf.getvalue(), "application/zip")})
+    assert response.status_code == 201, response.text
+    assert response.json() == {"memories": 1, "photos": 1, "date_ideas": 1, "milestones": 1}
+    memories = (await client.get("/api/memories")).json()["memories"]
+    assert [len(m["photos"]) for m in memories] == [1, 1]
+
+
+async def test_invalid_row_past_first_batch_rejects_import(client):
+    memories = [{"title": f"Day {i}", "memory_date": "2022-01-01"} for i in range(1000)]
+    memories.append({"title": "", "memory_date": "2022-01-01"})
+    body = json.dumps({"memories": memories}).encode()
+
+    response = await client.post("/api/import", files={"file": ("export.json", body, "application/json")})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][:2] == ["memories", 1000]
+    assert (await client.get("/api/memories")).json()["total"] == 0
+
+
+async def test_rejects_non_export(client):
+    for body in (b"[]", b'{"memories": [', b'{"memories": {}}'):
+        response = await client.post("/api/import", files={"file": ("export.json", body, "application/json")})
+        assert response.status_code in (400, 422), body
@@ -0,0 +1,98 @@
+"""List endpoints render rows straight from asyncpg; ids must come out as strings."""
+import io
+import json
+import uuid
+
+import pytest
+from PIL import Image
+
+pytestmark = pytest.mark.anyio
+
+
+def _jpeg() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (32, 32), "tomato").save(buf, "JPEG")
+    return buf.getvalue()
+
+
+def _is_uuid(value) -> bool:
+    return isinstance(value, str) and str(uuid.UUID(value)) == value
+
+
+async def _memory_with_photo(client) -> dict:
+    response = await client.post("/api/memories", json={
+        "title": "Lighthouse picnic",
+        "content": "Sandwiches on the rocks",
+        "memory_date": "2024-06-01",
+        "tags": ["outdoors"],
+    })
+    assert response.status_code == 201, response.text
+    memory = response.json()
+    response = await client.post(
+        f"/api/memories/{memory['id']}/photos",
+        files=[("files", ("rocks.jpg", _jpeg(), "image/jpeg"))],
+    )
+    assert response.status_code == 201, response.text
+    return memory
+
+
+async def test_list_memories(client):
+    memory = await _memory_with_photo(client)
+
+    response = await client.get("/api/memories")
+    assert response.status_code == 200, response.text
+    [item] = response.json()["memories"]
+    assert item["id"] == memory["id"]
+    assert _is_uuid(item["created_by"])
+    assert item["memory_date"] == "2024-06-01"
+    assert [_is_uuid(p["id"]) for p in item["photos"]] == [True]
+
+    response = await client.get("/api/memories?view=card")
+    assert response.status_code == 200, response.text
+    [card] = response.json()["memories"]
+    assert card["id"] == memory["id"]
+    assert card["photo_count"] == 1
+    assert _is_uuid(card["cover_photo"]["id"])
+
+
+async def test_list_date_ideas_and_milestones(client):
+    response = await client.post("/api/dates", json={"title": "Night market"})
+    assert response.status_code == 201, response.text
+    idea = response.json()
+    response = await client.post("/api/milestones", json={"title": "First date", "milestone_date": "2019-05-04"})
+    assert response.status_code == 201, response.text
+    milestone = response.json()
+
+    response = await client.get("/api/dates")
+    assert response.status_code == 200, response.text
+    [item] = response.json()
+    assert item["id"] == idea["id"]
+    assert _is_uuid(item["created_by"])
+
+    response = await client.get("/api/milestones")
+    assert response.status_code == 200, response.text
+    [item] = response.json()
+    assert item["id"] == milestone["id"]
+    assert item["milestone_date"] == "2019-05-04"
+
+
+async def test_search(client):
+    memory = await _memory_with_photo(client)
+
+    response = await client.get("/api/search?q=lighthouse")
+    assert response.status_code == 200, response.text
+    [hit] = response.json()
+    assert hit["id"] == memory["id"]
+
+
+async def test_export(client):
+    await _memory_with_photo(client)
+
+    response = await client.get("/api/export")
+    assert response.status_code == 200, response.text
+    document = json.loads(response.content)
+    assert _is_uuid(document["household"]["user_a_id"])
+    assert document["household"]["user_b_id"] is None
+    [memory] = document["memories"]
+    assert _is_uuid(memory["created_by"])
+    assert memory["photos"][0]["filename"] == "rocks.jpg"
@@ -0,0 +1,47 @@
+"""Memory writes build their responses from the statements that make them."""
+import io
+
+import pytest
+from PIL import Image
+from sqlalchemy import event
+
+from twoof_api.database import engine
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_update_returns_photos_from_the_update(client):
+    memory = (await client.post("/api/memories", json={"title": "Orchard", "memory_date": "2024-09-21"})).json()
+    for colour in ("red", "green"):
+        buf = io.BytesIO()
+        Image.new("RGB", (8, 8), colour).save(buf, "JPEG")
+        response = await client.post(
+            f"/api/memories/{memory['id']}/photos",
+            files=[("files", (f"{colour}.jpg", buf.getvalue(), "image/jpeg"))],
+        )
+        assert response.status_code == 201, response.text
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.put(f"/api/memories/{memory['id']}", json={"title": " Apple orchard "})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200, response.text
+    updated = response.json()
+    assert updated["title"] == "Apple orchard"
+    assert [p["filename"] for p in updated["photos"]] == ["red.jpg", "green.jpg"]
+    assert len([s for s in statements if "photos" in s]) == 1
+
+    response = await client.put(f"/api/memories/{memory['id']}", json={})
+    assert response.json()["photos"] == updated["photos"]
+
+
+async def test_update_missing_memory(client):
+    response = await client.put("/api/memories/00000000-0000-0000-0000-000000000000", json={"title": "Nope"})
+    assert response.status_code == 404
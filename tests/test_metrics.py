@@ -0,0 +1,24 @@
+"""Statement timing survives failed statements on pooled connections."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from twoof_api.database import engine
+from twoof_api.metrics import RequestStats, current_request
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_statement_leaves_no_timing_behind(client):
+    stats = RequestStats()
+    token = current_request.set(stats)
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(DBAPIError):
+                await conn.execute(text("SELECT 1 / 0"))
+            await conn.rollback()
+            await conn.execute(text("SELECT 1"))
+            assert "twoof_query_start" not in conn.sync_connection.info
+    finally:
+        current_request.reset(token)
+    assert stats.queries == 1
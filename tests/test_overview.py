@@ -0,0 +1,21 @@
+"""The overview cache must not outlive a change made through another worker."""
+import pytest
+
+from twoof_api.changes import overview_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_overview_follows_change_version(client):
+    response = await client.get("/api/overview")
+    assert response.status_code == 200, response.text
+    assert response.json()["totals"]["memories"] == 0
+    stale = dict(overview_cache._data)
+
+    response = await client.post("/api/memories", json={"title": "Ferry ride", "memory_date": "2024-07-14"})
+    assert response.status_code == 201, response.text
+    # Another worker never saw the invalidation and still holds the old entry
+    overview_cache._data.update(stale)
+
+    response = await client.get("/api/overview")
+    assert response.json()["totals"]["memories"] == 1
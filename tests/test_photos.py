@@ -0,0 +1,45 @@
+"""Photo serving, with the disk checks done off the event loop."""
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from twoof_api.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def _photo(client) -> dict:
+    memory = (await client.post("/api/memories", json={"title": "Dunes", "memory_date": "2023-05-06"})).json()
+    buf = io.BytesIO()
+    Image.new("RGB", (800, 600), "khaki").save(buf, "JPEG")
+    response = await client.post(
+        f"/api/memories/{memory['id']}/photos",
+        files=[("files", ("dunes.jpg", buf.getvalue(), "image/jpeg"))],
+    )
+    assert response.status_code == 201, response.text
+    return response.json()[0]
+
+
+async def test_serve_full_and_thumb(client):
+    photo = await _photo(client)
+
+    response = await client.get(f"/api/photos/{photo['id']}/file")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    assert int(response.headers["content-length"]) == photo["size_bytes"]
+
+    for _ in range(2):  # rendered, then served from disk
+        response = await client.get(f"/api/photos/{photo['id']}/file?size=thumb")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+
+
+async def test_missing_file_is_404(client):
+    photo = await _photo(client)
+    for path in Path(settings.data_dir).rglob("*.jpg"):
+        path.unlink()
+
+    response = await client.get(f"/api/photos/{photo['id']}/file")
+    assert response.status_code == 404
@@ -0,0 +1,41 @@
+"""The reminder scan reads milestones by their stored next occurrence."""
+from datetime import date, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select, update
+
+from twoof_api.database import engine
+from twoof_api.models import Milestone, ReminderOutbox
+from twoof_api.reminders import scan
+
+pytestmark = pytest.mark.anyio
+
+
+def _years_ago(d: date, years: int) -> date:
+    return d.replace(year=d.year - years) if (d.month, d.day) != (2, 29) else d.replace(year=d.year - years, day=28)
+
+
+async def test_scan_rolls_stale_occurrences_forward(client):
+    today = date.today()
+    soon = today + timedelta(days=3)
+    response = await client.post("/api/milestones", json={
+        "title": "Engagement", "milestone_date": _years_ago(soon, 4).isoformat(), "recurring": True,
+    })
+    assert response.status_code == 201, response.text
+    milestone_id = UUID(response.json()["id"])
+    # As if nobody had opened the app since last year's occurrence
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(Milestone).where(Milestone.id == milestone_id).values(next_occurrence=_years_ago(soon, 1))
+        )
+
+    await scan(today, 7, 100)
+
+    async with engine.connect() as conn:
+        stored = await conn.scalar(select(Milestone.next_occurrence).where(Milestone.id == milestone_id))
+        queued = (
+            await conn.execute(select(ReminderOutbox.occurs_on).where(ReminderOutbox.subject_id == milestone_id))
+        ).scalars().all()
+    assert stored == soon
+    assert queued == [soon]
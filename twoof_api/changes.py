@@ -0,0 +1,92 @@
+from uuid import UUID
+
+from sqlalchemy import Text, cast, delete, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import TTLCache
+from .config import settings
+from .models import Household, HouseholdEvent
+from .schemas import BatchItemResult
+
+# household id -> ((change version, date), OverviewResponse)
+overview_cache = TTLCache(
+    maxsize=settings.overview_cache_size,
+    ttl=settings.overview_cache_ttl,
+)
+
+# NOTIFY channel for committed changes; payload "<household id>:<version>"
+CHANGES_CHANNEL = "twoof_changes"
+
+# Larger sets are sent without ids; clients refetch the whole list instead
+MAX_CHANGE_IDS = 100
+
+
+def change(entity: str, op: str, *ids: UUID | str) -> dict:
+    """One entry of a change event, e.g. change("memory", "updated", memory.id)."""
+    entry = {"entity": entity, "op": op}
+    if len(ids) <= MAX_CHANGE_IDS:
+        entry["ids"] = [str(i) for i in ids]
+    return entry
+
+
+_BATCH_OPS = {"create": "created", "delete": "deleted"}
+
+
+def batch_changes(entity: str, results: list[BatchItemResult]) -> list[dict]:
+    """Change entries for the items a batch endpoint applied."""
+    ids: dict[str, list[str]] = {}
+    for r in results:
+        if r.status == "ok":
+            ids.setdefault(_BATCH_OPS.get(r.op, "updated"), []).append(r.id)
+    return [change(entity, op, *dict.fromkeys(i)) for op, i in ids.items()]
+
+
+async def record_change(household_id: UUID, db: AsyncSession, *changes: dict) -> int:
+    """Advance the household's change version; call before committing a write.
+
+    One statement bumps the version, logs `changes` under it for
+    /api/events replay (pruning entries past settings.events_history) and
+    queues a NOTIFY that Postgres delivers on commit. The row lock taken on
+    the household is held until commit, so concurrent writers are ordered
+    and versions follow commit order.
+    """
+    bumped = (
+        update(Household)
+        .where(Household.id == household_id)
+        .values(change_version=Household.change_version + 1)
+        .returning(Household.id, Household.change_version)
+        .cte("bumped")
+    )
+    logged = (
+        insert(HouseholdEvent)
+        .from_select(
+            ["household_id", "version", "changes"],
+            select(bumped.c.id, bumped.c.change_version, literal(list(changes), JSONB)),
+        )
+        .returning(HouseholdEvent.household_id, HouseholdEvent.version)
+        .cte("logged")
+    )
+    pruned = (
+        delete(HouseholdEvent)
+        .where(
+            HouseholdEvent.household_id == household_id,
+            HouseholdEvent.version <= select(bumped.c.change_version).scalar_subquery() - settings.events_history,
+        )
+        .cte("pruned")
+    )
+    payload = cast(logged.c.household_id, Text) + ":" + cast(logged.c.version, Text)
+    result = await db.execute(
+        select(logged.c.version, func.pg_notify(CHANGES_CHANNEL, payload)).add_cte(pruned)
+    )
+    return result.scalar()
+
+
+async def change_version(household_id: UUID, db: AsyncSession) -> int:
+    """Current change version, read by primary key."""
+    return await db.scalar(select(Household.change_version).where(Household.id == household_id)) or 0
+
+
+def household_changed(household_id: UUID) -> None:
+    """Call after committing any write to a household's data."""
+    overview_cache.invalidate(household_id)
@@ -9,6 +9,19 @@ class Settings(BaseSettings):
     db_max_overflow: int = 3
     log_level: str = "INFO"
     workers: int = 1
+    household_cache_size: int = 4096
+    household_cache_ttl: float = 30.0
+    overview_cache_size: int = 4096
+    overview_cache_ttl: float = 60.0
+    # Per-request SQL instrumentation (see querylog.py); off by default
+    query_log: bool = False
+    query_log_max_queries: int = 15
+    query_log_max_db_ms: float = 250.0
+    query_log_repeat_threshold: int = 5
+    # /api/events: change versions kept for Last-Event-ID replay, and how
+    # often idle streams get a keepalive comment
+    events_history: int = 1000
+    events_keepalive: float = 25.0
 
     model_config = {"env_prefix": "SHELF_"}
 
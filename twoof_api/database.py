@@ -1,5 +1,8 @@
+import time
+
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from .config import settings
+from .metrics import POOL_CHECKOUT_SECONDS, install_query_hooks
 
 url = settings.db_url
 if url.startswith("postgresql://"):
@@ -12,9 +15,15 @@ engine = create_async_engine(
     connect_args={"server_settings": {"search_path": "twoof,public"}},
 )
 
+install_query_hooks(engine)
+
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
 async def get_db():
     async with async_session() as session:
+        # Check out up front (every route queries anyway) to time pool waits
+        start = time.perf_counter()
+        await session.connection()
+        POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
         yield session
@@ -0,0 +1,37 @@
+from datetime import date
+from uuid import UUID
+
+from fastapi import Request, Response
+
+# Lists change whenever the household does: clients keep them but revalidate
+# every time, which costs one version lookup when nothing has changed.
+LIST_CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak If-None-Match comparison against `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def list_etag(household_id: UUID, version: int, day: date | None = None) -> str:
+    """Weak tag for a household list at a change version.
+
+    Caches key responses by URL, so query parameters need not be part of the
+    tag. Lists with date-relative fields pass `day` to expire at midnight.
+    """
+    tag = f"{household_id}-{version}"
+    if day is not None:
+        tag += f"-{day.isoformat()}"
+    return f'W/"{tag}"'
+
+
+def list_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=list_headers(etag))
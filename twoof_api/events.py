@@ -0,0 +1,180 @@
+"""Fan committed household changes out to /api/events streams.
+
+Write routes log each change version to twoof.household_events and NOTIFY
+CHANGES_CHANNEL with "<household id>:<version>" (see changes.record_change).
+Every worker keeps one dedicated asyncpg connection LISTENing on that
+channel. On a notification for a household with open streams, the hub reads
+the new event rows once and puts them on each subscriber's queue, so an idle
+stream costs a queue and a parked coroutine, never a pooled connection.
+
+The listener pings its connection every LISTEN_PING_INTERVAL seconds and
+reconnects when it closes or stops answering. After a reconnect the hub
+reads each subscribed household's missed events once and fans them out, so
+nothing committed in between is lost and streams don't each re-query.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import select
+
+from .changes import CHANGES_CHANNEL
+from .database import engine
+from .models import HouseholdEvent
+
+logger = logging.getLogger("twoof.events")
+
+QUEUE_SIZE = 64
+RECONNECT_DELAY = 2.0
+LISTEN_PING_INTERVAL = 30.0
+LISTEN_PING_TIMEOUT = 5.0
+
+
+@dataclass(frozen=True)
+class Event:
+    version: int
+    changes: list[dict]
+
+
+# Queued instead of an event when a subscriber fell QUEUE_SIZE events behind;
+# it should catch up from the event table.
+RESYNC = None
+
+
+async def events_since(household_id: UUID, version: int) -> list[Event]:
+    """Logged events after `version`, oldest first."""
+    async with engine.connect() as conn:
+        rows = await conn.execute(
+            select(HouseholdEvent.version, HouseholdEvent.changes)
+            .where(HouseholdEvent.household_id == household_id, HouseholdEvent.version > version)
+            .order_by(HouseholdEvent.version)
+        )
+        return [Event(version, changes) for version, changes in rows]
+
+
+class ChangeHub:
+    def __init__(self):
+        self._subscribers: dict[UUID, set[asyncio.Queue]] = {}
+        # Version each subscribed household's streams have been brought to
+        self._seen: dict[UUID, int] = {}
+        self._pending: asyncio.Queue[tuple[UUID, int]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    def subscribe(self, household_id: UUID) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.setdefault(household_id, set()).add(queue)
+        return queue
+
+    def track(self, household_id: UUID, version: int) -> None:
+        """Note the version a new subscriber read after subscribing.
+
+        The hub's position for the household starts there unless it is
+        already fanning events out for it; reconnect catch-ups read from it.
+        """
+        if household_id in self._subscribers:
+            self._seen.setdefault(household_id, version)
+
+    def unsubscribe(self, household_id: UUID, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(household_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[household_id]
+            self._seen.pop(household_id, None)
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._listen()), asyncio.create_task(self._pump())]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _on_notify(self, conn, pid, channel, payload: str) -> None:
+        try:
+            household_id, version = payload.split(":")
+            household_id, version = UUID(household_id), int(version)
+        except ValueError:
+            logger.warning(f"Ignoring malformed change notification: {payload!r}")
+            return
+        if household_id in self._subscribers:
+            self._pending.put_nowait((household_id, version))
+
+    async def _listen(self) -> None:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn, timeout=LISTEN_PING_TIMEOUT)
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _: closed.set())
+                await conn.add_listener(CHANGES_CHANNEL, self._on_notify)
+                logger.info("Listening for household changes")
+                # Anything committed while we weren't listening
+                self._catch_up_all()
+                await self._watch(conn, closed)
+                logger.warning("Change listener connection lost; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Change listener failed: {exc!r}; retrying in {RECONNECT_DELAY}s")
+            finally:
+                if conn is not None:
+                    conn.terminate()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _watch(self, conn: asyncpg.Connection, closed: asyncio.Event) -> None:
+        """Return when the connection closes; raise when it stops answering."""
+        while True:
+            try:
+                await asyncio.wait_for(closed.wait(), LISTEN_PING_INTERVAL)
+                return
+            except asyncio.TimeoutError:
+                pass
+            # A half-open socket never fires the termination listener
+            await conn.fetchval("SELECT 1", timeout=LISTEN_PING_TIMEOUT)
+
+    def _catch_up_all(self) -> None:
+        # One log read per household, coalesced by _pump like notifications
+        for household_id, version in list(self._seen.items()):
+            self._pending.put_nowait((household_id, version + 1))
+
+    async def _pump(self) -> None:
+        while True:
+            household_id, version = await self._pending.get()
+            # Coalesce a burst of notifications into one read per household
+            wanted = {household_id: version}
+            while not self._pending.empty():
+                hid, v = self._pending.get_nowait()
+                wanted[hid] = min(wanted.get(hid, v), v)
+            for hid, v in wanted.items():
+                try:
+                    await self._deliver(hid, v)
+                except Exception as exc:
+                    logger.warning(f"Could not deliver changes for household {hid}: {exc}")
+
+    async def _deliver(self, household_id: UUID, version: int) -> None:
+        if household_id not in self._subscribers:
+            return
+        after = self._seen.get(household_id, version - 1)
+        for event in await events_since(household_id, after):
+            self._seen[household_id] = event.version
+            for queue in self._subscribers.get(household_id, ()):
+                _offer(queue, event)
+
+
+def _offer(queue: asyncio.Queue, event: Event) -> None:
+    """Queue `event`, or replace a full backlog with a single RESYNC."""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC)
+
+
+change_hub = ChangeHub()
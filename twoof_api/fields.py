@@ -0,0 +1,28 @@
+from typing import Sequence
+
+from fastapi import HTTPException, Query
+
+
+def fields_query():
+    return Query(
+        None,
+        description="Comma-separated sparse fieldset, e.g. id,title,memory_date. "
+        "Omit for every field; id is always included.",
+    )
+
+
+def parse_fields(fields: str | None, allowed: Sequence[str]) -> list[str]:
+    """Resolve ?fields=a,b,c against a response's field names.
+
+    Returns the selected names in `allowed` order (all of them when
+    `fields` is empty). Unknown names are a 400 so typos don't silently
+    return less data.
+    """
+    if not fields:
+        return list(allowed)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return [f for f in allowed if f in requested]
@@ -0,0 +1,53 @@
+import os
+import tempfile
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+# Named derivative sizes and their maximum width in pixels. "full" is the
+# original upload and is never re-encoded.
+DERIVATIVE_WIDTHS = {
+    "thumb": 320,
+    "medium": 1024,
+}
+PHOTO_SIZES = ("thumb", "medium", "full")
+WEBP_QUALITY = 80
+
+
+def derivative_path(photo_id, size: str) -> str:
+    """Path of a derivative, relative to data_dir."""
+    return f"photos/derived/{photo_id}_{size}.webp"
+
+
+def generate_derivative(source: Path, dest: Path, width: int) -> dict:
+    """Render `source` as a WebP no wider than `width`.
+
+    Blocking (decode + resize + encode); call it through a thread. The file is
+    written next to `dest` and renamed into place so concurrent readers never
+    see a partial image.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+        if img.width > width:
+            img.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+        # A temp file per render: concurrent first requests for one size
+        # must not write to (or rename) each other's file.
+        fd, name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.stem}-", suffix=".part")
+        tmp = Path(name)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                img.save(fh, "WEBP", quality=WEBP_QUALITY, method=4)
+            size_bytes = tmp.stat().st_size
+            tmp.replace(dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return {
+            "width": img.width,
+            "height": img.height,
+            "size_bytes": size_bytes,
+            "mime_type": "image/webp",
+        }
@@ -7,25 +7,32 @@ from datetime import datetime
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 from pathlib import Path
 
 from .config import settings
 from .database import engine
+from .events import change_hub
+from .metrics import MetricsMiddleware, render_metrics
 
 
 # ── Logging ───────────────────────────────────────────────────────────
 
 class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
-        return json.dumps({
+        entry = {
             "ts": datetime.utcnow().isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
-        })
+        }
+        # Structured fields passed as logger.x(..., extra={"data": {...}})
+        data = getattr(record, "data", None)
+        if isinstance(data, dict):
+            entry.update(data)
+        return json.dumps(entry, default=str)
 
 
 handler = logging.StreamHandler(sys.stdout)
@@ -80,23 +87,31 @@ async def lifespan(app: FastAPI):
     photos_dir = Path(settings.data_dir) / "photos"
     photos_dir.mkdir(parents=True, exist_ok=True)
 
+    await change_hub.start()
     logger.info("TwoOf ready")
     yield
     logger.info("TwoOf shutting down")
+    await change_hub.stop()
 
 
 # ── App ───────────────────────────────────────────────────────────────
 
 app = FastAPI(title="TwoOf", version="1.0.0", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 # Routes
-from .routes.household import router as household_router
+from .changes import overview_cache
+from .routes.household import router as household_router, household_cache
 from .routes.memories import router as memories_router
 from .routes.photos import router as photos_router
 from .routes.dates import router as dates_router
 from .routes.milestones import router as milestones_router
 from .routes.search import router as search_router
+from .routes.stats import router as stats_router
 from .routes.export import router as export_router
+from .routes.imports import router as import_router
+from .routes.overview import router as overview_router
+from .routes.events import router as events_router
 
 app.include_router(household_router)
 app.include_router(memories_router)
@@ -104,7 +119,11 @@ app.include_router(photos_router)
 app.include_router(dates_router)
 app.include_router(milestones_router)
 app.include_router(search_router)
+app.include_router(stats_router)
 app.include_router(export_router)
+app.include_router(import_router)
+app.include_router(overview_router)
+app.include_router(events_router)
 
 
 # ── Health ────────────────────────────────────────────────────────────
@@ -120,10 +139,25 @@ async def health():
         pass
     return JSONResponse(
         status_code=200 if db_ok else 503,
-        content={"status": "ok" if db_ok else "degraded", "db": db_ok, "app": "twoof", "version": "1.0.0"},
+        content={
+            "status": "ok" if db_ok else "degraded",
+            "db": db_ok,
+            "app": "twoof",
+            "version": "1.0.0",
+            "household_cache": household_cache.stats(),
+            "overview_cache": overview_cache.stats(),
+        },
     )
 
 
+# ── Metrics ───────────────────────────────────────────────────────────
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics(engine)
+    return Response(content=body, media_type=content_type)
+
+
 # ── Error handlers ────────────────────────────────────────────────────
 
 @app.exception_handler(RequestValidationError)
@@ -0,0 +1,150 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from . import querylog
+from .config import settings
+
+# Metrics are per process; with several uvicorn workers, scrape each one.
+
+REQUEST_SECONDS = Histogram(
+    "twoof_http_request_duration_seconds",
+    "Time to serve a request, including streaming the body",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "twoof_http_requests_in_flight",
+    "Requests currently being served",
+)
+DB_QUERY_SECONDS = Histogram(
+    "twoof_db_query_duration_seconds",
+    "Time spent executing a single SQL statement",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "twoof_db_queries_per_request",
+    "SQL statements executed while serving one request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 12, 20, 50, 100),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "twoof_db_time_per_request_seconds",
+    "Total SQL execution time while serving one request",
+    ["route"],
+)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "twoof_db_pool_checkout_wait_seconds",
+    "Time a request waited for a pooled connection",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_CONNECTIONS = Gauge(
+    "twoof_db_pool_connections",
+    "Pooled connections by state",
+    ["state"],
+)
+PHOTO_UPLOAD_BYTES = Counter(
+    "twoof_photo_upload_bytes",
+    "Photo bytes received by uploads",
+)
+PHOTO_SERVED_BYTES = Counter(
+    "twoof_photo_served_bytes",
+    "Photo bytes sent to clients (originals and derivatives)",
+)
+EVENT_STREAMS = Gauge(
+    "twoof_event_streams",
+    "Open /api/events streams",
+)
+
+PHOTO_FILE_ROUTE = "/api/photos/{photo_id}/file"
+# Long-lived streams would skew in-flight and latency; EVENT_STREAMS covers them
+EVENTS_ROUTE = "/api/events"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    # (statement, seconds) for every query; only kept when query logging is on
+    statements: list[tuple[str, float]] | None = None
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("twoof_request_stats", default=None)
+
+
+def install_query_hooks(engine: AsyncEngine) -> None:
+    """Time every statement and attribute it to the request being served."""
+
+    # The start time lives on the statement's execution context rather than
+    # the connection: a failed statement never reaches _after, and its
+    # context is simply dropped with it.
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._twoof_query_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._twoof_query_start
+        DB_QUERY_SECONDS.observe(elapsed)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+            if stats.statements is not None:
+                stats.statements.append((statement, elapsed))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed bodies are included in the timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == EVENTS_ROUTE:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(statements=[] if settings.query_log else None)
+        token = current_request.set(stats)
+        status = 500
+        body_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            current_request.reset(token)
+
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            REQUEST_SECONDS.labels(scope["method"], template, str(status)).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(template).observe(stats.queries)
+            DB_SECONDS_PER_REQUEST.labels(template).observe(stats.db_seconds)
+            if template == PHOTO_FILE_ROUTE:
+                PHOTO_SERVED_BYTES.inc(body_bytes)
+            if settings.query_log:
+                querylog.report(stats, scope["method"], template, status, elapsed)
+
+
+def render_metrics(engine: AsyncEngine) -> tuple[bytes, str]:
+    pool = engine.pool
+    POOL_CONNECTIONS.labels("checked_out").set(pool.checkedout())
+    POOL_CONNECTIONS.labels("checked_in").set(pool.checkedin())
+    POOL_CONNECTIONS.labels("overflow").set(max(pool.overflow(), 0))
+    POOL_CONNECTIONS.labels("size").set(pool.size())
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,5 +1,4 @@
 import uuid
-from datetime import date, datetime
 
 from sqlalchemy import (
     Column,
@@ -10,11 +9,15 @@ from sqlalchemy import (
     DateTime,
     SmallInteger,
     BigInteger,
+    Integer,
     ForeignKey,
     Index,
+    Computed,
+    func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from sqlalchemy.orm import DeclarativeBase, relationship
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import DeclarativeBase, relationship, deferred
 
 
 class Base(DeclarativeBase):
@@ -34,7 +37,9 @@ class Household(Base):
     user_a_id = Column(UUID(as_uuid=True), nullable=False)
     user_b_id = Column(UUID(as_uuid=True), nullable=True)
     anniversary = Column(Date, nullable=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Bumped by every write to the household's data; list ETags are built from it
+    change_version = Column(BigInteger, nullable=False, server_default=text("0"))
 
     memories = relationship("Memory", back_populates="household", cascade="all, delete-orphan")
     date_ideas = relationship("DateIdea", back_populates="household", cascade="all, delete-orphan")
@@ -44,9 +49,17 @@ class Household(Base):
 class Memory(Base):
     __tablename__ = "memories"
     __table_args__ = (
-        Index("idx_memories_household", "household_id"),
-        Index("idx_memories_date", "memory_date"),
+        Index("idx_memories_household_date", "household_id", "memory_date"),
         Index("idx_memories_tags", "tags", postgresql_using="gin"),
+        Index("idx_memories_search", "search_vector", postgresql_using="gin"),
+        Index(
+            "idx_memories_timeline",
+            "household_id",
+            text("pinned DESC"),
+            text("memory_date DESC"),
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
         {"schema": "twoof"},
     )
 
@@ -60,7 +73,18 @@ class Memory(Base):
     mood = Column(String(20), nullable=True)
     tags = Column(ARRAY(Text), default=list)
     pinned = Column(Boolean, nullable=False, default=False)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Maintained by Postgres (migration 002); never written by the app.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'C') || "
+            "setweight(to_tsvector('english', twoof.tags_to_text(tags)), 'D')",
+            persisted=True,
+        ),
+    ))
 
     household = relationship("Household", back_populates="memories")
     photos = relationship("Photo", back_populates="memory", cascade="all, delete-orphan")
@@ -70,21 +94,39 @@ class Photo(Base):
     __tablename__ = "photos"
     __table_args__ = (
         Index("idx_photos_memory", "memory_id"),
+        Index("idx_photos_content_hash", "content_hash"),
         {"schema": "twoof"},
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     memory_id = Column(UUID(as_uuid=True), ForeignKey("twoof.memories.id", ondelete="CASCADE"), nullable=False)
     file_path = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # NULL for pre-dedup uploads
     filename = Column(String(500), nullable=False)
     mime_type = Column(String(100), nullable=False)
     size_bytes = Column(BigInteger, nullable=False)
     sort_order = Column(SmallInteger, nullable=False, default=0)
-    uploaded_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    uploaded_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # size name -> {"width", "height", "size_bytes", "mime_type"}; files live
+    # at images.derivative_path(id, size).
+    derivatives = Column(JSONB, nullable=False, default=dict)
 
     memory = relationship("Memory", back_populates="photos")
 
 
+class PhotoBlob(Base):
+    """One stored file per distinct photo content, shared by every Photo with that hash."""
+
+    __tablename__ = "photo_blobs"
+    __table_args__ = {"schema": "twoof"}
+
+    content_hash = Column(String(64), primary_key=True)
+    file_path = Column(Text, nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
 class DateIdea(Base):
     __tablename__ = "date_ideas"
     __table_args__ = (
@@ -104,7 +146,7 @@ class DateIdea(Base):
     done = Column(Boolean, nullable=False, default=False)
     done_date = Column(Date, nullable=True)
     priority = Column(SmallInteger, nullable=False, default=0)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     household = relationship("Household", back_populates="date_ideas")
 
@@ -112,7 +154,8 @@ class DateIdea(Base):
 class Milestone(Base):
     __tablename__ = "milestones"
     __table_args__ = (
-        Index("idx_milestones_household", "household_id"),
+        Index("idx_milestones_next", "household_id", "next_occurrence"),
+        Index("idx_milestones_occurrence", "next_occurrence"),
         {"schema": "twoof"},
     )
 
@@ -123,6 +166,61 @@ class Milestone(Base):
     milestone_date = Column(Date, nullable=False)
     recurring = Column(Boolean, nullable=False, default=False)
     icon = Column(String(10), nullable=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    # milestone_date for one-offs; the coming anniversary for recurring ones.
+    # Kept current by routes.milestones.refresh_next_occurrences().
+    next_occurrence = Column(Date, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     household = relationship("Household", back_populates="milestones")
+
+
+class HouseholdStat(Base):
+    """Running counters per household, maintained by triggers (migration 008).
+
+    kind/key: ("month", "YYYY-MM"), ("tag", tag), ("mood", mood), ("photos", "").
+    """
+
+    __tablename__ = "household_stats"
+    __table_args__ = {"schema": "twoof"}
+
+    household_id = Column(UUID(as_uuid=True), primary_key=True)
+    kind = Column(String(20), primary_key=True)
+    key = Column(Text, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    bytes = Column(BigInteger, nullable=False, default=0)
+
+
+class ReminderOutbox(Base):
+    """Due reminders waiting to be delivered; written by `python -m twoof_api.reminders`."""
+
+    __tablename__ = "reminder_outbox"
+    __table_args__ = (
+        Index("idx_reminder_outbox_pending", "created_at", postgresql_where=text("sent_at IS NULL")),
+        {"schema": "twoof"},
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # "<kind>:<subject_id>:<occurs_on>" - one reminder per occurrence
+    idempotency_key = Column(String(200), nullable=False, unique=True)
+    household_id = Column(UUID(as_uuid=True), ForeignKey("twoof.households.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(20), nullable=False)  # "milestone" | "anniversary"
+    subject_id = Column(UUID(as_uuid=True), nullable=False)
+    title = Column(String(500), nullable=False)
+    occurs_on = Column(Date, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class HouseholdEvent(Base):
+    """One row per household change version, written by changes.record_change.
+
+    changes: [{"entity": "memory", "op": "updated", "ids": [...]}, ...]
+    """
+
+    __tablename__ = "household_events"
+    __table_args__ = {"schema": "twoof"}
+
+    household_id = Column(UUID(as_uuid=True), ForeignKey("twoof.households.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, primary_key=True)
+    changes = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,73 @@
+import hashlib
+import logging
+import re
+from collections import Counter
+
+from .config import settings
+
+logger = logging.getLogger("twoof.querylog")
+
+_PARAM_LIST = re.compile(r"\(\s*\$\d+(?:\s*::\s*[\w\[\]]+)?(?:\s*,\s*\$\d+(?:\s*::\s*[\w\[\]]+)?)*\s*\)")
+_PARAM = re.compile(r"\$\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Collapse a statement to its shape: IN-lists of any length and
+    parameter numbering no longer distinguish otherwise identical queries."""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _PARAM_LIST.sub("(?)", text)
+    return _PARAM.sub("?", text)
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode()).hexdigest()[:12]
+
+
+def report(stats, method: str, route: str, status: int, elapsed: float) -> None:
+    """Log a request whose SQL use crossed the configured limits.
+
+    `stats.statements` holds (statement, seconds) pairs, recorded by the
+    engine hooks in metrics.py while query logging is enabled.
+    """
+    statements = stats.statements or []
+    db_ms = stats.db_seconds * 1000
+    shapes: Counter[str] = Counter()
+    seconds: Counter[str] = Counter()
+    samples: dict[str, str] = {}
+    for statement, took in statements:
+        fp = fingerprint(statement)
+        shapes[fp] += 1
+        seconds[fp] += took
+        samples.setdefault(fp, normalize(statement)[:300])
+
+    repeated = {fp: n for fp, n in shapes.items() if n >= settings.query_log_repeat_threshold}
+    too_many = stats.queries > settings.query_log_max_queries
+    too_slow = db_ms > settings.query_log_max_db_ms
+    if not (repeated or too_many or too_slow):
+        return
+
+    reasons = [r for r, hit in (("query_count", too_many), ("db_time", too_slow), ("n_plus_one", repeated)) if hit]
+    logger.warning(
+        f"SQL budget exceeded ({', '.join(reasons)}): {method} {route} "
+        f"{stats.queries} queries, {db_ms:.1f}ms in DB",
+        extra={"data": {
+            "method": method,
+            "route": route,
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 1),
+            "queries": stats.queries,
+            "db_ms": round(db_ms, 1),
+            "reasons": reasons,
+            "statements": [
+                {
+                    "fingerprint": fp,
+                    "count": n,
+                    "db_ms": round(seconds[fp] * 1000, 1),
+                    "n_plus_one": fp in repeated,
+                    "sql": samples[fp],
+                }
+                for fp, n in shapes.most_common()
+            ],
+        }},
+    )
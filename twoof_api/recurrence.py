@@ -0,0 +1,21 @@
+from datetime import date
+
+from sqlalchemy import Date, Integer, Interval, case, cast, func, literal
+
+
+def next_occurrence(date_expr, recurring_expr, today: date):
+    """SQL expression for the next time a (possibly yearly) date falls on or after `today`.
+
+    One-off dates are returned unchanged. Recurring dates are moved to this
+    year, or next year if that has already passed. Postgres clamps date +
+    interval at month end, so Feb 29 lands on Feb 28 in non-leap years.
+    """
+    today = literal(today, Date)
+    years = cast(func.extract("year", today) - func.extract("year", date_expr), Integer)
+    this_year = cast(date_expr + func.make_interval(years, type_=Interval), Date)
+    next_year = cast(date_expr + func.make_interval(years + 1, type_=Interval), Date)
+    return case(
+        (recurring_expr.is_(False), date_expr),
+        (this_year >= today, this_year),
+        else_=next_year,
+    )
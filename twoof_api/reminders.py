@@ -0,0 +1,123 @@
+"""Queue reminders for milestones and anniversaries coming up soon.
+
+Run once a day (e.g. from cron):
+
+    python -m twoof_api.reminders --days 7
+
+Recurring milestones whose stored next occurrence has passed are first
+rolled forward with one UPDATE. Due occurrences across every household are
+then found with one set-based query (milestones by their stored
+next_occurrence, on idx_milestones_occurrence), read through a server-side
+cursor and written to twoof.reminder_outbox in
+batches, each in its own short transaction. Every reminder carries an
+idempotency key, so re-running the scan (or resuming a crashed one) never
+queues the same occurrence twice.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, timedelta
+
+from sqlalchemy import literal, select, true, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .config import settings
+from .database import engine
+from .models import Household, Milestone, ReminderOutbox
+from .recurrence import next_occurrence
+
+logger = logging.getLogger("twoof.reminders")
+
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_BATCH_SIZE = 1000
+
+
+def due_reminders_query(today: date, window_days: int):
+    """Every milestone and anniversary occurring within `window_days` of `today`."""
+    until = today + timedelta(days=window_days)
+
+    milestones = select(
+        literal("milestone").label("kind"),
+        Milestone.household_id,
+        Milestone.id.label("subject_id"),
+        Milestone.title,
+        Milestone.next_occurrence.label("occurs_on"),
+    ).where(Milestone.next_occurrence.between(today, until))
+
+    anniversary_on = next_occurrence(Household.anniversary, true(), today)
+    anniversaries = select(
+        literal("anniversary").label("kind"),
+        Household.id.label("household_id"),
+        Household.id.label("subject_id"),
+        Household.name.label("title"),
+        anniversary_on.label("occurs_on"),
+    ).where(Household.anniversary.isnot(None), anniversary_on.between(today, until))
+
+    return union_all(milestones, anniversaries)
+
+
+def _outbox_row(row) -> dict:
+    return {
+        "idempotency_key": f"{row.kind}:{row.subject_id}:{row.occurs_on.isoformat()}",
+        "household_id": row.household_id,
+        "kind": row.kind,
+        "subject_id": row.subject_id,
+        "title": row.title,
+        "occurs_on": row.occurs_on,
+    }
+
+
+async def roll_forward(today: date) -> int:
+    """Move recurring milestones whose stored occurrence has passed on to the next one.
+
+    Rows are never rolled past the real date, so a scan run ahead with
+    --today can't hide an occurrence the app still has to show.
+    """
+    as_of = min(today, date.today())
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            update(Milestone)
+            .where(Milestone.next_occurrence < as_of, Milestone.recurring.is_(True))
+            .values(next_occurrence=next_occurrence(Milestone.milestone_date, Milestone.recurring, as_of))
+        )
+    return max(result.rowcount, 0)
+
+
+async def scan(today: date, window_days: int, batch_size: int) -> tuple[int, int]:
+    """Queue due reminders; returns (occurrences seen, reminders newly queued)."""
+    await roll_forward(today)
+    seen = queued = 0
+    query = due_reminders_query(today, window_days).execution_options(yield_per=batch_size)
+    async with engine.connect() as reader:
+        result = await reader.stream(query)
+        async for partition in result.partitions():
+            rows = [_outbox_row(r) for r in partition]
+            async with engine.begin() as writer:
+                inserted = await writer.execute(
+                    pg_insert(ReminderOutbox.__table__)
+                    .values(rows)
+                    .on_conflict_do_nothing(index_elements=["idempotency_key"])
+                )
+            seen += len(rows)
+            queued += max(inserted.rowcount, 0)
+    return seen, queued
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m twoof_api.reminders", description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=DEFAULT_WINDOW_DAYS, help="look-ahead window in days")
+    parser.add_argument("--today", type=date.fromisoformat, default=None, help="scan as of this date (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    today = args.today or date.today()
+    try:
+        seen, queued = await scan(today, args.days, args.batch_size)
+    finally:
+        await engine.dispose()
+    logger.info(f"Reminder scan for {today} (+{args.days}d): {seen} due, {queued} newly queued")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.log_level.upper(), format="%(message)s")
+    asyncio.run(main())
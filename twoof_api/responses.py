@@ -0,0 +1,19 @@
+"""JSON rendering for responses built straight from database rows."""
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def dumps(content) -> bytes:
+    """orjson.dumps that also takes asyncpg's UUID values.
+
+    asyncpg returns UUID columns as its own uuid.UUID subclass, which orjson
+    refuses; default=str renders them as str() would.
+    """
+    return orjson.dumps(content, default=str)
+
+
+class RowsResponse(ORJSONResponse):
+    """ORJSONResponse for row dicts; see dumps()."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -1,19 +1,40 @@
+from collections import defaultdict
 from uuid import UUID
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, insert, update, delete, desc, case, literal, null, Date
 from shelf_auth_middleware import get_current_user, ShelfUser
 
+from ..changes import batch_changes, change, change_version, household_changed, record_change
 from ..database import get_db
+from ..etags import etag_matches, list_etag, list_headers, not_modified
+from ..fields import fields_query, parse_fields
 from ..models import DateIdea
-from ..schemas import DateIdeaCreate, DateIdeaUpdate, DateIdeaResponse
+from ..responses import RowsResponse
+from ..schemas import (
+    BatchItemResult,
+    BatchResult,
+    DateIdeaBatch,
+    DateIdeaCreate,
+    DateIdeaUpdate,
+    DateIdeaResponse,
+)
 from .household import get_user_household
 
 router = APIRouter(prefix="/api/dates", tags=["dates"])
 
 
+# Columns of DateIdeaResponse, for list views rendered straight from rows
+IDEA_COLUMNS = (
+    DateIdea.id, DateIdea.created_by, DateIdea.title, DateIdea.description, DateIdea.category,
+    DateIdea.estimated_cost, DateIdea.location, DateIdea.url, DateIdea.done, DateIdea.done_date,
+    DateIdea.priority, DateIdea.created_at,
+)
+IDEA_FIELDS = tuple(c.key for c in IDEA_COLUMNS)
+
+
 def _idea_response(d: DateIdea) -> DateIdeaResponse:
     return DateIdeaResponse(
         id=str(d.id),
@@ -33,9 +54,11 @@ def _idea_response(d: DateIdea) -> DateIdeaResponse:
 
 @router.get("", response_model=list[DateIdeaResponse])
 async def list_date_ideas(
+    request: Request,
     category: str | None = Query(None),
     done: bool | None = Query(None),
     priority: int | None = Query(None, ge=0, le=3),
+    fields: str | None = fields_query(),
     user: ShelfUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -44,7 +67,13 @@ async def list_date_ideas(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    query = select(DateIdea).where(DateIdea.household_id == household.id)
+    wanted = parse_fields(fields, IDEA_FIELDS)
+    version = await change_version(household.id, db)
+    etag = list_etag(household.id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    query = select(*(c for c in IDEA_COLUMNS if c.key in wanted)).where(DateIdea.household_id == household.id)
 
     if category:
         query = query.where(DateIdea.category == category)
@@ -54,8 +83,8 @@ async def list_date_ideas(
         query = query.where(DateIdea.priority == priority)
 
     query = query.order_by(desc(DateIdea.priority), desc(DateIdea.created_at))
-    rows = (await db.execute(query)).scalars().all()
-    return [_idea_response(d) for d in rows]
+    rows = await db.execute(query)
+    return RowsResponse([row._asdict() for row in rows], headers=list_headers(etag))
 
 
 @router.post("", response_model=DateIdeaResponse, status_code=201)
@@ -69,55 +98,159 @@ async def create_date_idea(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    idea = DateIdea(
-        household_id=household.id,
-        created_by=uid,
-        title=data.title.strip(),
-        description=data.description,
-        category=data.category,
-        estimated_cost=data.estimated_cost,
-        location=data.location,
-        url=data.url,
-        priority=data.priority,
+    idea = await db.scalar(
+        insert(DateIdea)
+        .values(
+            household_id=household.id,
+            created_by=uid,
+            title=data.title.strip(),
+            description=data.description,
+            category=data.category,
+            estimated_cost=data.estimated_cost,
+            location=data.location,
+            url=data.url,
+            priority=data.priority,
+        )
+        .returning(DateIdea)
     )
-    db.add(idea)
+    await record_change(household.id, db, change("date_idea", "created", idea.id))
     await db.commit()
-    await db.refresh(idea)
+    household_changed(household.id)
     return _idea_response(idea)
 
 
-@router.put("/{idea_id}", response_model=DateIdeaResponse)
-async def update_date_idea(
-    idea_id: str,
-    data: DateIdeaUpdate,
+@router.post("/batch", response_model=BatchResult)
+async def batch_date_ideas(
+    data: DateIdeaBatch,
     user: ShelfUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    """Apply many create/update/delete/done operations in one transaction.
+
+    Operations are grouped by kind and run as set-based statements: creates,
+    then updates, done changes and finally deletes. Items naming an idea
+    outside the household are reported as not_found and skipped.
+    """
     uid = UUID(user.id)
     household = await get_user_household(uid, db)
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    idea = (
-        await db.execute(
-            select(DateIdea).where(
-                DateIdea.id == UUID(idea_id),
-                DateIdea.household_id == household.id,
+    ops = data.ops
+    referenced = {op.id for op in ops if op.op != "create"}
+    found = set()
+    if referenced:
+        found = set(
+            (
+                await db.scalars(
+                    select(DateIdea.id)
+                    .where(DateIdea.id.in_(referenced), DateIdea.household_id == household.id)
+                    .with_for_update()
+                )
+            ).all()
+        )
+
+    results = [
+        BatchItemResult(
+            index=i,
+            op=op.op,
+            id=str(op.id) if op.op != "create" else None,
+            status="ok" if op.op == "create" or op.id in found else "not_found",
+        )
+        for i, op in enumerate(ops)
+    ]
+    live = [(i, op) for i, op in enumerate(ops) if results[i].status == "ok"]
+
+    creates = [(i, op.data) for i, op in live if op.op == "create"]
+    if creates:
+        new_ids = (
+            await db.scalars(
+                insert(DateIdea).returning(DateIdea.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "household_id": household.id,
+                        "created_by": uid,
+                        "title": d.title.strip(),
+                        "description": d.description,
+                        "category": d.category,
+                        "estimated_cost": d.estimated_cost,
+                        "location": d.location,
+                        "url": d.url,
+                        "priority": d.priority,
+                    }
+                    for _, d in creates
+                ],
             )
+        ).all()
+        for (i, _), idea_id in zip(creates, new_ids):
+            results[i].id = str(idea_id)
+
+    # One executemany per distinct set of updated columns
+    updates: dict[frozenset, list[dict]] = defaultdict(list)
+    for _, op in live:
+        if op.op == "update":
+            values = op.data.model_dump(exclude_unset=True)
+            if values.get("title"):
+                values["title"] = values["title"].strip()
+            if values:
+                updates[frozenset(values)].append({"id": op.id, **values})
+    for rows in updates.values():
+        await db.execute(update(DateIdea), rows)
+
+    # Ideas already in the requested state keep their done_date
+    done: dict[bool, list[UUID]] = defaultdict(list)
+    for _, op in live:
+        if op.op == "done":
+            done[op.done].append(op.id)
+    for value, ids in done.items():
+        await db.execute(
+            update(DateIdea)
+            .where(DateIdea.id.in_(ids), DateIdea.done.isnot(value))
+            .values(done=value, done_date=date.today() if value else None)
+            .execution_options(synchronize_session=False)
         )
-    ).scalar_one_or_none()
 
-    if not idea:
-        raise HTTPException(status_code=404, detail="Date idea not found")
+    deletes = [op.id for _, op in live if op.op == "delete"]
+    if deletes:
+        await db.execute(
+            delete(DateIdea).where(DateIdea.id.in_(deletes)).execution_options(synchronize_session=False)
+        )
+
+    await record_change(household.id, db, *batch_changes("date_idea", results))
+    await db.commit()
+    household_changed(household.id)
+    return BatchResult(results=results)
+
+
+@router.put("/{idea_id}", response_model=DateIdeaResponse)
+async def update_date_idea(
+    idea_id: str,
+    data: DateIdeaUpdate,
+    user: ShelfUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    uid = UUID(user.id)
+    household = await get_user_household(uid, db)
+    if not household:
+        raise HTTPException(status_code=404, detail="No household found")
 
     update_data = data.model_dump(exclude_unset=True)
     if "title" in update_data and update_data["title"]:
         update_data["title"] = update_data["title"].strip()
-    for key, value in update_data.items():
-        setattr(idea, key, value)
 
-    await db.commit()
-    await db.refresh(idea)
+    where = (DateIdea.id == UUID(idea_id), DateIdea.household_id == household.id)
+    if update_data:
+        idea = await db.scalar(update(DateIdea).where(*where).values(**update_data).returning(DateIdea))
+    else:
+        idea = await db.scalar(select(DateIdea).where(*where))
+
+    if not idea:
+        raise HTTPException(status_code=404, detail="Date idea not found")
+
+    if update_data:
+        await record_change(household.id, db, change("date_idea", "updated", idea.id))
+        await db.commit()
+        household_changed(household.id)
     return _idea_response(idea)
 
 
@@ -145,7 +278,9 @@ async def delete_date_idea(
         raise HTTPException(status_code=404, detail="Date idea not found")
 
     await db.delete(idea)
+    await record_change(household.id, db, change("date_idea", "deleted", idea.id))
     await db.commit()
+    household_changed(household.id)
 
 
 @router.patch("/{idea_id}/done", response_model=DateIdeaResponse)
@@ -159,21 +294,21 @@ async def toggle_done(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    idea = (
-        await db.execute(
-            select(DateIdea).where(
-                DateIdea.id == UUID(idea_id),
-                DateIdea.household_id == household.id,
-            )
+    # SET sees the old row, so done_date follows the flipped value
+    idea = await db.scalar(
+        update(DateIdea)
+        .where(DateIdea.id == UUID(idea_id), DateIdea.household_id == household.id)
+        .values(
+            done=~DateIdea.done,
+            done_date=case((DateIdea.done, null()), else_=literal(date.today(), Date)),
         )
-    ).scalar_one_or_none()
+        .returning(DateIdea)
+    )
 
     if not idea:
         raise HTTPException(status_code=404, detail="Date idea not found")
 
-    idea.done = not idea.done
-    idea.done_date = date.today() if idea.done else None
-
+    await record_change(household.id, db, change("date_idea", "updated", idea.id))
     await db.commit()
-    await db.refresh(idea)
+    household_changed(household.id)
     return _idea_response(idea)
@@ -0,0 +1,101 @@
+import asyncio
+from typing import AsyncIterator
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from shelf_auth_middleware import get_current_user, ShelfUser
+
+from ..changes import change_version
+from ..config import settings
+from ..database import get_db, async_session
+from ..events import RESYNC, change_hub, events_since
+from ..metrics import EVENT_STREAMS
+from .household import get_user_household
+
+router = APIRouter(prefix="/api", tags=["events"])
+
+# Browser reconnect delay after a dropped stream
+RETRY_MS = 3000
+
+
+def _frame(event: str, version: int, data: dict) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (version, event.encode(), orjson.dumps(data))
+
+
+async def _catch_up(household_id: UUID, last: int, current: int | None = None) -> tuple[list[bytes], int]:
+    """Frames for everything after `last`, and the version they bring the client to.
+
+    When the log no longer reaches back to `last` (pruned, or the client's id
+    is from elsewhere) a single "reset" frame tells it to reload everything.
+    """
+    events = await events_since(household_id, last)
+    head = events[-1].version if events else (current if current is not None else last)
+    if head < last or (head > last and (not events or events[0].version != last + 1)):
+        return [_frame("reset", head, {"version": head})], head
+    frames = [_frame("change", e.version, {"version": e.version, "changes": e.changes}) for e in events]
+    return frames, head
+
+
+async def _stream(household_id: UUID, last_event_id: int | None) -> AsyncIterator[bytes]:
+    # Subscribe before reading the log so nothing lands in between.
+    queue = change_hub.subscribe(household_id)
+    EVENT_STREAMS.inc()
+    try:
+        yield b"retry: %d\n\n" % RETRY_MS
+        async with async_session() as session:
+            current = await change_version(household_id, session)
+        change_hub.track(household_id, current)
+        if last_event_id is None:
+            last = current
+            yield _frame("ready", last, {"version": last})
+        else:
+            frames, last = await _catch_up(household_id, last_event_id, current)
+            for frame in frames:
+                yield frame
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), settings.events_keepalive)
+            except asyncio.TimeoutError:
+                # Keeps proxies from timing out the idle connection
+                yield b": keepalive\n\n"
+                continue
+            if event is RESYNC or event.version > last + 1:
+                frames, last = await _catch_up(household_id, last)
+                for frame in frames:
+                    yield frame
+            elif event.version == last + 1:
+                last = event.version
+                yield _frame("change", last, {"version": last, "changes": event.changes})
+    finally:
+        EVENT_STREAMS.dec()
+        change_hub.unsubscribe(household_id, queue)
+
+
+@router.get("/events")
+async def household_events(
+    last_event_id: int | None = Header(None, alias="Last-Event-ID", ge=0),
+    user: ShelfUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Server-Sent Events: one "change" event per committed household change.
+
+    Each event's id is the household change version and its data lists the
+    changes as {"entity", "op", "ids"}. "ids" is left out when too many rows
+    changed to list. Browsers resume with Last-Event-ID after a reconnect.
+    A "reset" event means the missed changes are no longer available, so the
+    client should reload.
+    """
+    uid = UUID(user.id)
+    household = await get_user_household(uid, db)
+    if not household:
+        raise HTTPException(status_code=404, detail="No household found")
+
+    return StreamingResponse(
+        _stream(household.id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,97 +1,220 @@
-import json
+import asyncio
+import logging
+import zipfile
+from pathlib import Path
+from typing import AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, cast, distinct, text, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from shelf_auth_middleware import get_current_user, ShelfUser
 
-from ..database import get_db
-from ..models import Household, Memory, Photo, DateIdea, Milestone
-from .household import get_user_household
+from ..config import settings
+from ..database import get_db, async_session
+from ..models import Memory, Photo, DateIdea, Milestone
+from ..responses import dumps
+from .household import HouseholdInfo, get_user_household
 
 router = APIRouter(prefix="/api", tags=["export"])
+logger = logging.getLogger("twoof.export")
 
+# Rows fetched per round trip from the server-side cursors
+EXPORT_BATCH_SIZE = 500
+FILE_CHUNK_SIZE = 256 * 1024
 
-@router.get("/export")
-async def export_data(
-    user: ShelfUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    uid = UUID(user.id)
-    household = await get_user_household(uid, db)
-    if not household:
-        raise HTTPException(status_code=404, detail="No household found")
 
-    hid = household.id
+def _photos_json(with_files: bool):
+    """Correlated subquery returning a memory's photos as a JSON array (text)."""
+    fields = [
+        "filename", Photo.filename,
+        "mime_type", Photo.mime_type,
+        "size_bytes", Photo.size_bytes,
+    ]
+    if with_files:
+        fields += ["file", Photo.file_path]
+    return (
+        select(
+            cast(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(func.json_build_object(*fields), Photo.sort_order)),
+                    text("'[]'::json"),
+                ),
+                Text,
+            )
+        )
+        .where(Photo.memory_id == Memory.id)
+        .scalar_subquery()
+    )
 
-    memories = (await db.execute(select(Memory).where(Memory.household_id == hid).order_by(Memory.memory_date))).scalars().all()
-    photos = (await db.execute(select(Photo).where(Photo.memory_id.in_([m.id for m in memories])))).scalars().all() if memories else []
-    date_ideas = (await db.execute(select(DateIdea).where(DateIdea.household_id == hid).order_by(DateIdea.created_at))).scalars().all()
-    milestones = (await db.execute(select(Milestone).where(Milestone.household_id == hid).order_by(Milestone.milestone_date))).scalars().all()
 
-    photo_map: dict[str, list] = {}
-    for p in photos:
-        photo_map.setdefault(str(p.memory_id), []).append({
-            "filename": p.filename,
-            "mime_type": p.mime_type,
-            "size_bytes": p.size_bytes,
-        })
+async def _json_array(session: AsyncSession, query, to_dict) -> AsyncIterator[bytes]:
+    """Render a query's rows as JSON array items, one chunk per fetched batch."""
+    result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    sep = b"\n"
+    async for partition in result.partitions():
+        items = [dumps(to_dict(row)) for row in partition]
+        yield sep + b",\n".join(items)
+        sep = b",\n"
+    yield b"\n"
 
-    export = {
+
+async def _export_json(household: HouseholdInfo, session: AsyncSession, with_files: bool) -> AsyncIterator[bytes]:
+    """Emit the export document piece by piece, one batch of rows at a time."""
+    hid = household.id
+    header = {
         "app": "twoof",
         "version": "1.0.0",
         "household": {
             "name": household.name,
             "user_a_id": str(household.user_a_id),
             "user_b_id": str(household.user_b_id) if household.user_b_id else None,
-            "anniversary": household.anniversary.isoformat() if household.anniversary else None,
+            "anniversary": household.anniversary,
         },
-        "memories": [
-            {
-                "title": m.title,
-                "content": m.content,
-                "memory_date": m.memory_date.isoformat(),
-                "location": m.location,
-                "mood": m.mood,
-                "tags": m.tags or [],
-                "pinned": m.pinned,
-                "created_by": str(m.created_by),
-                "photos": photo_map.get(str(m.id), []),
-            }
-            for m in memories
-        ],
-        "date_ideas": [
-            {
-                "title": d.title,
-                "description": d.description,
-                "category": d.category,
-                "estimated_cost": d.estimated_cost,
-                "location": d.location,
-                "url": d.url,
-                "done": d.done,
-                "done_date": d.done_date.isoformat() if d.done_date else None,
-                "priority": d.priority,
-                "created_by": str(d.created_by),
-            }
-            for d in date_ideas
-        ],
-        "milestones": [
-            {
-                "title": m.title,
-                "description": m.description,
-                "milestone_date": m.milestone_date.isoformat(),
-                "recurring": m.recurring,
-                "icon": m.icon,
-            }
-            for m in milestones
-        ],
     }
+    yield orjson.dumps(header)[:-1] + b', "memories": ['
+
+    memories_q = (
+        select(
+            Memory.title, Memory.content, Memory.memory_date, Memory.location, Memory.mood,
+            Memory.tags, Memory.pinned, Memory.created_by,
+            _photos_json(with_files).label("photos"),
+        )
+        .where(Memory.household_id == hid)
+        .order_by(Memory.memory_date, Memory.id)
+    )
+    # Photos arrive as JSON text from Postgres and are spliced in as-is
+    async for chunk in _json_array(session, memories_q, lambda m: {
+        **m._mapping,
+        "tags": m.tags or [],
+        "photos": orjson.Fragment(m.photos),
+    }):
+        yield chunk
+
+    yield b'], "date_ideas": ['
+    ideas_q = (
+        select(
+            DateIdea.title, DateIdea.description, DateIdea.category, DateIdea.estimated_cost,
+            DateIdea.location, DateIdea.url, DateIdea.done, DateIdea.done_date,
+            DateIdea.priority, DateIdea.created_by,
+        )
+        .where(DateIdea.household_id == hid)
+        .order_by(DateIdea.created_at, DateIdea.id)
+    )
+    async for chunk in _json_array(session, ideas_q, lambda d: d._asdict()):
+        yield chunk
+
+    yield b'], "milestones": ['
+    milestones_q = (
+        select(
+            Milestone.title, Milestone.description, Milestone.milestone_date,
+            Milestone.recurring, Milestone.icon,
+        )
+        .where(Milestone.household_id == hid)
+        .order_by(Milestone.milestone_date, Milestone.id)
+    )
+    async for chunk in _json_array(session, milestones_q, lambda m: m._asdict()):
+        yield chunk
+    yield b"]}\n"
+
+
+async def _stream_json(household: HouseholdInfo) -> AsyncIterator[bytes]:
+    # The request's session is closed before the body is sent, so the
+    # stream needs a session of its own.
+    async with async_session() as session:
+        async for chunk in _export_json(household, session, with_files=False):
+            yield chunk
+
+
+class _ZipSink:
+    """Write-only, unseekable file object that hands back what zipfile wrote."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _stream_zip(household: HouseholdInfo) -> AsyncIterator[bytes]:
+    """Stream a ZIP of export.json plus every photo file, built on the fly.
+
+    zipfile falls back to data descriptors on an unseekable sink, so each
+    entry is written (and sent) as it is produced and neither the archive nor
+    any single photo is held in memory.
+    """
+    data_dir = Path(settings.data_dir)
+    sink = _ZipSink()
+    async with async_session() as session:
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+            with zf.open("export.json", mode="w") as entry:
+                async for chunk in _export_json(household, session, with_files=True):
+                    entry.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+
+            # Deduplicated blobs are shared between photos; archive each once.
+            files_q = (
+                select(distinct(Photo.file_path))
+                .join(Memory, Memory.id == Photo.memory_id)
+                .where(Memory.household_id == household.id)
+                .order_by(Photo.file_path)
+                .execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            result = await session.stream(files_q)
+            async for (file_path,) in result:
+                source = data_dir / file_path
+                try:
+                    fh = await asyncio.to_thread(open, source, "rb")
+                except OSError:
+                    logger.warning(f"Export skipped missing photo file {file_path}")
+                    continue
+                try:
+                    # Images are already compressed
+                    info = zipfile.ZipInfo(file_path)
+                    info.compress_type = zipfile.ZIP_STORED
+                    with zf.open(info, mode="w") as entry:
+                        while chunk := await asyncio.to_thread(fh.read, FILE_CHUNK_SIZE):
+                            entry.write(chunk)
+                            yield sink.drain()
+                finally:
+                    await asyncio.to_thread(fh.close)
+                yield sink.drain()
+    yield sink.drain()
+
+
+@router.get("/export")
+async def export_data(
+    format: str = Query("json", pattern="^(json|zip)$"),
+    user: ShelfUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    uid = UUID(user.id)
+    household = await get_user_household(uid, db)
+    if not household:
+        raise HTTPException(status_code=404, detail="No household found")
+
+    if format == "zip":
+        return StreamingResponse(
+            _stream_zip(household),
+            media_type="application/zip",
+            headers={"Content-Disposition": "attachment; filename=twoof-export.zip"},
+        )
 
-    content = json.dumps(export, indent=2, default=str)
     return StreamingResponse(
-        iter([content]),
+        _stream_json(household),
         media_type="application/json",
         headers={"Content-Disposition": "attachment; filename=twoof-export.json"},
     )
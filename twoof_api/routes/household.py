@@ -1,11 +1,16 @@
 import secrets
+from dataclasses import dataclass
+from datetime import date, datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, insert, update, or_
 from shelf_auth_middleware import get_current_user, ShelfUser
 
+from ..cache import TTLCache
+from ..changes import change, household_changed, record_change
+from ..config import settings
 from ..database import get_db
 from ..models import Household
 from ..schemas import HouseholdCreate, HouseholdJoin, HouseholdUpdate, HouseholdResponse
@@ -13,7 +18,44 @@ from ..schemas import HouseholdCreate, HouseholdJoin, HouseholdUpdate, Household
 router = APIRouter(prefix="/api", tags=["household"])
 
 
-async def get_user_household(user_id: UUID, db: AsyncSession) -> Household | None:
+@dataclass(frozen=True)
+class HouseholdInfo:
+    """Immutable snapshot of a household row, safe to share across sessions."""
+
+    id: UUID
+    name: str
+    invite_code: str | None
+    user_a_id: UUID
+    user_b_id: UUID | None
+    anniversary: date | None
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, h: Household) -> "HouseholdInfo":
+        return cls(
+            id=h.id,
+            name=h.name,
+            invite_code=h.invite_code,
+            user_a_id=h.user_a_id,
+            user_b_id=h.user_b_id,
+            anniversary=h.anniversary,
+            created_at=h.created_at,
+        )
+
+
+# user id -> HouseholdInfo. Only positive lookups are cached so a user who
+# creates or joins a household on another worker is never told they have none.
+household_cache = TTLCache(
+    maxsize=settings.household_cache_size,
+    ttl=settings.household_cache_ttl,
+)
+
+
+def invalidate_household(h: Household | HouseholdInfo) -> None:
+    household_cache.invalidate(*(uid for uid in (h.user_a_id, h.user_b_id) if uid))
+
+
+async def _load_household(user_id: UUID, db: AsyncSession) -> Household | None:
     result = await db.execute(
         select(Household).where(
             or_(Household.user_a_id == user_id, Household.user_b_id == user_id)
@@ -22,7 +64,20 @@ async def get_user_household(user_id: UUID, db: AsyncSession) -> Household | Non
     return result.scalar_one_or_none()
 
 
-def _household_response(h: Household) -> HouseholdResponse:
+async def get_user_household(user_id: UUID, db: AsyncSession) -> HouseholdInfo | None:
+    cached = household_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    household = await _load_household(user_id, db)
+    if household is None:
+        return None
+    info = HouseholdInfo.from_model(household)
+    household_cache.set(user_id, info)
+    return info
+
+
+def _household_response(h: Household | HouseholdInfo) -> HouseholdResponse:
     return HouseholdResponse(
         id=str(h.id),
         name=h.name,
@@ -45,15 +100,19 @@ async def create_household(
     if existing:
         raise HTTPException(status_code=409, detail="Already in a household")
 
-    household = Household(
-        name=data.name.strip(),
-        invite_code=secrets.token_urlsafe(6)[:8].upper(),
-        user_a_id=uid,
-        anniversary=data.anniversary,
+    household = await db.scalar(
+        insert(Household)
+        .values(
+            name=data.name.strip(),
+            invite_code=secrets.token_urlsafe(6)[:8].upper(),
+            user_a_id=uid,
+            anniversary=data.anniversary,
+        )
+        .returning(Household)
     )
-    db.add(household)
     await db.commit()
-    await db.refresh(household)
+    invalidate_household(household)
+    household_changed(household.id)
     return _household_response(household)
 
 
@@ -81,20 +140,30 @@ async def join_household(
         raise HTTPException(status_code=409, detail="Already in a household")
 
     code = data.invite_code.strip().upper()
-    household = (
-        await db.execute(select(Household).where(Household.invite_code == code))
-    ).scalar_one_or_none()
+    # Claim the free seat in one statement; only look closer if that fails.
+    household = await db.scalar(
+        update(Household)
+        .where(
+            Household.invite_code == code,
+            Household.user_b_id.is_(None),
+            Household.user_a_id != uid,
+        )
+        .values(user_b_id=uid)
+        .returning(Household)
+    )
 
     if not household:
-        raise HTTPException(status_code=404, detail="Invalid invite code")
-    if household.user_b_id is not None:
-        raise HTTPException(status_code=409, detail="Household is full")
-    if household.user_a_id == uid:
+        existing = await db.scalar(select(Household).where(Household.invite_code == code))
+        if not existing:
+            raise HTTPException(status_code=404, detail="Invalid invite code")
+        if existing.user_b_id is not None:
+            raise HTTPException(status_code=409, detail="Household is full")
         raise HTTPException(status_code=400, detail="Cannot join your own household")
 
-    household.user_b_id = uid
+    await record_change(household.id, db, change("household", "updated", household.id))
     await db.commit()
-    await db.refresh(household)
+    invalidate_household(household)
+    household_changed(household.id)
     return _household_response(household)
 
 
@@ -105,18 +174,29 @@ async def update_household(
     db: AsyncSession = Depends(get_db),
 ):
     uid = UUID(user.id)
-    household = await get_user_household(uid, db)
+    update_data = data.model_dump(exclude_unset=True)
+    if update_data.get("name"):
+        update_data["name"] = update_data["name"].strip()
+
+    if not update_data:
+        household = await _load_household(uid, db)
+        if not household:
+            raise HTTPException(status_code=404, detail="No household found")
+        return _household_response(household)
+
+    household = await db.scalar(
+        update(Household)
+        .where(or_(Household.user_a_id == uid, Household.user_b_id == uid))
+        .values(**update_data)
+        .returning(Household)
+    )
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    update_data = data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        if key == "name" and value:
-            value = value.strip()
-        setattr(household, key, value)
-
+    await record_change(household.id, db, change("household", "updated", household.id))
     await db.commit()
-    await db.refresh(household)
+    invalidate_household(household)
+    household_changed(household.id)
     return _household_response(household)
 
 
@@ -126,11 +206,17 @@ async def regenerate_invite(
     db: AsyncSession = Depends(get_db),
 ):
     uid = UUID(user.id)
-    household = await get_user_household(uid, db)
+    household = await db.scalar(
+        update(Household)
+        .where(or_(Household.user_a_id == uid, Household.user_b_id == uid))
+        .values(invite_code=secrets.token_urlsafe(6)[:8].upper())
+        .returning(Household)
+    )
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    household.invite_code = secrets.token_urlsafe(6)[:8].upper()
+    await record_change(household.id, db, change("household", "updated", household.id))
     await db.commit()
-    await db.refresh(household)
+    invalidate_household(household)
+    household_changed(household.id)
     return _household_response(household)
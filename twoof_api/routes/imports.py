@@ -0,0 +1,336 @@
+import asyncio
+import uuid as uuid_mod
+import zipfile
+from collections import Counter
+from contextlib import nullcontext
+from itertools import islice
+from pathlib import Path, PurePosixPath
+from typing import IO, AsyncIterator, ContextManager, Iterable, Iterator
+from uuid import UUID
+
+import ijson
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from shelf_auth_middleware import get_current_user, ShelfUser
+
+from ..config import settings
+from ..changes import change, household_changed, record_change
+from ..database import get_db
+from ..models import Memory, Photo, PhotoBlob, DateIdea, Milestone
+from ..schemas import ImportMemory, ImportDateIdea, ImportMilestone, ImportResult
+from ..storage import (
+    FileTooLargeError,
+    StagedFile,
+    blob_path,
+    discard_staged,
+    place_staged,
+    stage_stream,
+)
+from .household import HouseholdInfo, get_user_household
+from .milestones import scheduled_occurrence
+from .photos import ALLOWED_TYPES, EXT_MAP, MAX_FILE_SIZE, lock_blobs
+
+router = APIRouter(prefix="/api", tags=["import"])
+
+# Rows per multi-row INSERT; keeps every statement well under the 32767
+# bind-parameter limit for the widest table.
+IMPORT_BATCH_SIZE = 1000
+
+NOT_AN_EXPORT = "Not a TwoOf export (JSON or ZIP)"
+
+
+def _validated(model: type[BaseModel], items: Iterable, section: str, offset: int = 0) -> Iterator[BaseModel]:
+    for i, item in enumerate(items, offset):
+        try:
+            yield model.model_validate(item)
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=422,
+                detail=[
+                    {"loc": [section, i, *err["loc"]], "msg": err["msg"], "type": err["type"]}
+                    for err in exc.errors(include_url=False)
+                ],
+            )
+
+
+class _Document:
+    """The uploaded export, read one top-level section at a time (blocking).
+
+    Each section is a separate incremental pass over export.json, so the
+    document is never held in memory and sections may come in any order.
+    """
+
+    def __init__(self, upload: UploadFile):
+        self.file = upload.file
+        self.archive = None
+        try:
+            if zipfile.is_zipfile(self.file):
+                self.archive = zipfile.ZipFile(self.file)
+                self.archive.getinfo("export.json")
+        except (KeyError, zipfile.BadZipFile):
+            raise HTTPException(status_code=400, detail=NOT_AN_EXPORT)
+
+    def _open(self) -> ContextManager[IO[bytes]]:
+        if self.archive is not None:
+            return self.archive.open("export.json")
+        self.file.seek(0)
+        return nullcontext(self.file)
+
+    def items(self, section: str) -> Iterator:
+        """Items of the top-level `section` list; a missing or null section is empty."""
+        kind = None
+
+        def watch(events):
+            nonlocal kind
+            first = next(events, None)
+            if first is None or first[1] != "start_map":
+                raise HTTPException(status_code=400, detail=NOT_AN_EXPORT)
+            yield first
+            for prefix, event, value in events:
+                if kind is None and prefix == section:
+                    kind = event
+                yield prefix, event, value
+
+        try:
+            with self._open() as fh:
+                yield from ijson.items(watch(ijson.parse(fh, use_float=True)), f"{section}.item")
+        except ijson.JSONError:
+            raise HTTPException(status_code=400, detail=NOT_AN_EXPORT)
+        if kind not in (None, "start_array", "null"):
+            raise HTTPException(status_code=422, detail=[{"loc": [section], "msg": "Expected a list", "type": "list_type"}])
+
+    def close(self) -> None:
+        if self.archive is not None:
+            self.archive.close()
+
+
+async def _batches(items: Iterator) -> AsyncIterator[list]:
+    """Pull IMPORT_BATCH_SIZE items at a time from a blocking iterator, off the event loop."""
+    try:
+        while batch := await asyncio.to_thread(lambda: list(islice(items, IMPORT_BATCH_SIZE))):
+            yield batch
+    finally:
+        items.close()
+
+
+class _Importer:
+    """Buffers validated rows and writes them with multi-row INSERTs."""
+
+    def __init__(self, household: HouseholdInfo, uid: UUID, db: AsyncSession, archive: zipfile.ZipFile | None):
+        self.household = household
+        self.uid = uid
+        self.db = db
+        self.archive = archive
+        self.members = {str(uid) for uid in (household.user_a_id, household.user_b_id) if uid}
+        self.staged: dict[str, StagedFile] = {}  # archive path -> staged file
+        self.blob_refs: Counter[str] = Counter()
+        self.blob_paths: dict[str, str] = {}
+        self.blob_sizes: dict[str, int] = {}
+        self.counts = Counter()
+
+    def _author(self, created_by: str | None) -> UUID:
+        return UUID(created_by) if created_by in self.members else self.uid
+
+    async def _insert(self, model, rows: list[dict]) -> None:
+        if rows:
+            await self.db.execute(insert(model.__table__).values(rows))
+            self.counts[model.__tablename__] += len(rows)
+            rows.clear()
+
+    async def _validated(self, model: type[BaseModel], items: Iterator, section: str) -> AsyncIterator[BaseModel]:
+        """Validated section items, parsed and checked a batch at a time."""
+        offset = 0
+        async for batch in _batches(items):
+            for item in _validated(model, batch, section, offset):
+                yield item
+            offset += len(batch)
+
+    async def _stage_photo(self, name: str) -> StagedFile | None:
+        if self.archive is None:
+            return None
+        if name in self.staged:
+            return self.staged[name]
+        try:
+            info = self.archive.getinfo(name)
+        except KeyError:
+            return None
+        if info.file_size > MAX_FILE_SIZE:
+            raise HTTPException(status_code=400, detail=f"Photo {name} too large (max 10MB)")
+        entry = await asyncio.to_thread(self.archive.open, info)
+        try:
+            staged = await stage_stream(lambda n: asyncio.to_thread(entry.read, n), name, MAX_FILE_SIZE)
+        except FileTooLargeError:
+            raise HTTPException(status_code=400, detail=f"Photo {name} too large (max 10MB)")
+        finally:
+            await asyncio.to_thread(entry.close)
+        self.staged[name] = staged
+        return staged
+
+    async def memories(self, items: Iterator) -> None:
+        memory_rows: list[dict] = []
+        photo_rows: list[dict] = []
+        async for m in self._validated(ImportMemory, items, "memories"):
+            memory_id = uuid_mod.uuid4()
+            memory_rows.append({
+                "id": memory_id,
+                "household_id": self.household.id,
+                "created_by": self._author(m.created_by),
+                "title": m.title.strip(),
+                "content": m.content,
+                "memory_date": m.memory_date,
+                "location": m.location,
+                "mood": m.mood,
+                "tags": m.tags,
+                "pinned": m.pinned,
+            })
+            for order, p in enumerate(m.photos):
+                # Only ZIP exports carry the bytes; metadata alone can't be restored.
+                if not p.file or p.mime_type not in ALLOWED_TYPES:
+                    continue
+                staged = await self._stage_photo(p.file)
+                if staged is None:
+                    continue
+                ext = PurePosixPath(p.file).suffix or EXT_MAP[p.mime_type]
+                self.blob_refs[staged.content_hash] += 1
+                self.blob_paths.setdefault(staged.content_hash, blob_path(staged.content_hash, ext))
+                self.blob_sizes[staged.content_hash] = staged.size_bytes
+                photo_rows.append({
+                    "memory_id": memory_id,
+                    "file_path": self.blob_paths[staged.content_hash],
+                    "content_hash": staged.content_hash,
+                    "filename": p.filename,
+                    "mime_type": p.mime_type,
+                    "size_bytes": staged.size_bytes,
+                    "sort_order": order,
+                })
+            if len(memory_rows) >= IMPORT_BATCH_SIZE or len(photo_rows) >= IMPORT_BATCH_SIZE:
+                await self._insert(Memory, memory_rows)
+                await self._insert(Photo, photo_rows)
+        await self._insert(Memory, memory_rows)
+        await self._insert(Photo, photo_rows)
+
+    async def blobs(self) -> None:
+        """Take one reference per imported photo, a single upsert per batch."""
+        hashes = list(self.blob_refs)
+        await lock_blobs(hashes, self.db)
+        for start in range(0, len(hashes), IMPORT_BATCH_SIZE):
+            batch = hashes[start:start + IMPORT_BATCH_SIZE]
+            stmt = pg_insert(PhotoBlob).values([
+                {
+                    "content_hash": h,
+                    "file_path": self.blob_paths[h],
+                    "size_bytes": self.blob_sizes[h],
+                    "ref_count": self.blob_refs[h],
+                }
+                for h in batch
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[PhotoBlob.content_hash],
+                set_={"ref_count": PhotoBlob.ref_count + stmt.excluded.ref_count},
+            ).returning(PhotoBlob.content_hash, PhotoBlob.file_path)
+            for content_hash, file_path in (await self.db.execute(stmt)).all():
+                if file_path != self.blob_paths[content_hash]:
+                    # Same bytes already stored under another extension; only
+                    # this import's rows carry the path it picked.
+                    await self.db.execute(
+                        update(Photo)
+                        .where(
+                            Photo.content_hash == content_hash,
+                            Photo.file_path == self.blob_paths[content_hash],
+                            Photo.memory_id.in_(
+                                select(Memory.id).where(Memory.household_id == self.household.id)
+                            ),
+                        )
+                        .values(file_path=file_path)
+                        .execution_options(synchronize_session=False)
+                    )
+                    self.blob_paths[content_hash] = file_path
+
+    async def place_photos(self) -> None:
+        """Move staged photos to their blob paths; runs before commit, under the blob lock."""
+        data_dir = Path(settings.data_dir)
+        for staged in self.staged.values():
+            await place_staged(staged, data_dir / self.blob_paths[staged.content_hash])
+
+    async def date_ideas(self, items: Iterator) -> None:
+        rows: list[dict] = []
+        async for d in self._validated(ImportDateIdea, items, "date_ideas"):
+            rows.append({
+                "household_id": self.household.id,
+                "created_by": self._author(d.created_by),
+                "title": d.title.strip(),
+                "description": d.description,
+                "category": d.category,
+                "estimated_cost": d.estimated_cost,
+                "location": d.location,
+                "url": d.url,
+                "done": d.done,
+                "done_date": d.done_date,
+                "priority": d.priority,
+            })
+            if len(rows) >= IMPORT_BATCH_SIZE:
+                await self._insert(DateIdea, rows)
+        await self._insert(DateIdea, rows)
+
+    async def milestones(self, items: Iterator) -> None:
+        rows: list[dict] = []
+        async for m in self._validated(ImportMilestone, items, "milestones"):
+            rows.append({
+                "household_id": self.household.id,
+                "title": m.title.strip(),
+                "description": m.description,
+                "milestone_date": m.milestone_date,
+                "recurring": m.recurring,
+                "icon": m.icon,
+                "next_occurrence": scheduled_occurrence(m.milestone_date, m.recurring),
+            })
+            if len(rows) >= IMPORT_BATCH_SIZE:
+                await self._insert(Milestone, rows)
+        await self._insert(Milestone, rows)
+
+
+@router.post("/import", response_model=ImportResult, status_code=201)
+async def import_data(
+    file: UploadFile = File(...),
+    user: ShelfUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Restore an export (JSON, or ZIP with photos) into the user's household.
+
+    Everything is written in one transaction: any invalid row rejects the
+    whole import.
+    """
+    uid = UUID(user.id)
+    household = await get_user_household(uid, db)
+    if not household:
+        raise HTTPException(status_code=404, detail="No household found")
+
+    document = await asyncio.to_thread(_Document, file)
+    importer = _Importer(household, uid, db, document.archive)
+    try:
+        await importer.memories(document.items("memories"))
+        await importer.date_ideas(document.items("date_ideas"))
+        await importer.milestones(document.items("milestones"))
+        # Every section has been parsed and validated; only now take the
+        # blob locks and move files into place
+        await importer.blobs()
+        await importer.place_photos()
+        # Too many rows to list; clients reload everything
+        await record_change(household.id, db, change("household", "imported", household.id))
+        await db.commit()
+    except BaseException:
+        await discard_staged(list(importer.staged.values()))
+        raise
+    finally:
+        await asyncio.to_thread(document.close)
+    household_changed(household.id)
+
+    return ImportResult(
+        memories=importer.counts[Memory.__tablename__],
+        photos=importer.counts[Photo.__tablename__],
+        date_ideas=importer.counts[DateIdea.__tablename__],
+        milestones=importer.counts[Milestone.__tablename__],
+    )
@@ -1,23 +1,38 @@
-import os
+import base64
+import json
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Literal
 from uuid import UUID
-from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, extract
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import (
+    select, insert, update, delete, func, desc, extract, tuple_, text, bindparam, true, false, Text,
+)
 from shelf_auth_middleware import get_current_user, ShelfUser
 
-from ..config import settings
+from ..changes import batch_changes, change, change_version, household_changed, record_change
 from ..database import get_db
+from ..etags import etag_matches, list_etag, list_headers, not_modified
+from ..fields import fields_query, parse_fields
 from ..models import Memory, Photo
+from ..responses import RowsResponse
 from ..schemas import (
+    BatchItemResult,
+    BatchResult,
+    MemoryBatch,
     MemoryCreate,
     MemoryUpdate,
     MemoryResponse,
     MemoryListResponse,
+    MemoryCard,
+    MemoryCardListResponse,
     PhotoResponse,
 )
 from .household import get_user_household
+from .photos import ReleasedFiles, delete_released, release_photos
 
 router = APIRouter(prefix="/api/memories", tags=["memories"])
 
@@ -50,14 +65,84 @@ def _memory_response(m: Memory, photos: list[Photo] | None = None) -> MemoryResp
     )
 
 
-@router.get("", response_model=MemoryListResponse)
+# Columns of MemoryResponse / PhotoResponse, selected as plain rows for list
+# views. RowsResponse renders the UUID, date and datetime values exactly as
+# the _x_response helpers' str()/isoformat() would.
+MEMORY_COLUMNS = (
+    Memory.id, Memory.created_by, Memory.title, Memory.content, Memory.memory_date,
+    Memory.location, Memory.mood, Memory.tags, Memory.pinned, Memory.created_at,
+)
+PHOTO_COLUMNS = (
+    Photo.id, Photo.filename, Photo.mime_type, Photo.size_bytes, Photo.sort_order, Photo.uploaded_at,
+)
+PHOTO_KEYS = tuple(c.key for c in PHOTO_COLUMNS)
+MEMORY_FIELDS = tuple(MemoryResponse.model_fields)
+
+# Card view (view=card). The excerpt is cut in SQL; left() only detoasts the
+# leading slice of long content, and has_more checks one character past it.
+EXCERPT_CHARS = 240
+CARD_COLUMNS = (
+    Memory.id, Memory.created_by, Memory.title,
+    func.left(Memory.content, EXCERPT_CHARS).label("excerpt"),
+    func.coalesce(func.length(func.left(Memory.content, EXCERPT_CHARS + 1)) > EXCERPT_CHARS, false())
+    .label("has_more"),
+    Memory.memory_date, Memory.location, Memory.mood, Memory.tags, Memory.pinned, Memory.created_at,
+)
+CARD_FIELDS = tuple(MemoryCard.model_fields)
+
+# Per-memory photo count and first photo, correlated to the outer Memory row
+PHOTO_COUNT = select(func.count()).where(Photo.memory_id == Memory.id).scalar_subquery()
+COVER_PHOTO = (
+    select(*PHOTO_COLUMNS)
+    .where(Photo.memory_id == Memory.id)
+    .order_by(Photo.sort_order)
+    .limit(1)
+    .lateral("cover")
+)
+
+
+# Timeline order; idx_memories_timeline matches it column for column.
+TIMELINE_KEY = (Memory.pinned, Memory.memory_date, Memory.created_at, Memory.id)
+TIMELINE_KEYS = {c.key for c in TIMELINE_KEY}
+
+
+def _encode_cursor(m: Memory) -> str:
+    raw = json.dumps([m.pinned, m.memory_date.isoformat(), m.created_at.isoformat(), str(m.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[bool, date, datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        pinned, memory_date, created_at, memory_id = json.loads(raw)
+        return (
+            bool(pinned),
+            date.fromisoformat(memory_date),
+            datetime.fromisoformat(created_at),
+            UUID(memory_id),
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+@router.get("", response_model=MemoryListResponse | MemoryCardListResponse)
 async def list_memories(
+    request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    year: int | None = Query(None),
+    cursor: str | None = Query(None),
+    year: int | None = Query(None, ge=1, le=9998),
     month: int | None = Query(None, ge=1, le=12),
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
     tag: str | None = Query(None),
     pinned: bool | None = Query(None),
+    view: Literal["full", "card"] = Query("full"),
+    fields: str | None = fields_query(),
     user: ShelfUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -66,50 +151,104 @@ async def list_memories(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    query = select(Memory).where(Memory.household_id == household.id)
-
-    if year:
-        query = query.where(extract("year", Memory.memory_date) == year)
-    if month:
+    card = view == "card"
+    view_columns = CARD_COLUMNS if card else MEMORY_COLUMNS
+    wanted = parse_fields(fields, CARD_FIELDS if card else MEMORY_FIELDS)
+    after = _decode_cursor(cursor) if cursor is not None else None
+
+    # Parameters are validated first: a bad request stays a 400 even when
+    # the household hasn't changed
+    version = await change_version(household.id, db)
+    etag = list_etag(household.id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # The timeline key is always read: the next cursor is built from it.
+    columns = [c for c in view_columns if c.key in wanted or c.key in TIMELINE_KEYS]
+    query = select(*columns).where(Memory.household_id == household.id)
+
+    # Year/month become half-open date ranges so idx_memories_household_date
+    # can serve them. A month without a year spans every year and stays an
+    # extract() filter.
+    if year and month:
+        start = date(year, month, 1)
+        query = query.where(Memory.memory_date >= start, Memory.memory_date < _next_month(start))
+    elif year:
+        query = query.where(Memory.memory_date >= date(year, 1, 1), Memory.memory_date < date(year + 1, 1, 1))
+    elif month:
         query = query.where(extract("month", Memory.memory_date) == month)
+    if date_from:
+        query = query.where(Memory.memory_date >= date_from)
+    if date_to:
+        query = query.where(Memory.memory_date <= date_to)
     if tag:
         query = query.where(Memory.tags.any(tag))
     if pinned is not None:
         query = query.where(Memory.pinned == pinned)
 
-    # Count
-    count_q = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_q)).scalar() or 0
+    # Count only for the first request of a listing; cursor pages skip it
+    # and clients keep the total they were given up front.
+    total = None
+    if cursor is None:
+        count_q = select(func.count()).select_from(query.subquery())
+        total = (await db.execute(count_q)).scalar() or 0
+
+    # Card extras are joined after the count so it doesn't pay for them
+    if "photo_count" in wanted:
+        query = query.add_columns(PHOTO_COUNT.label("photo_count"))
+    if "cover_photo" in wanted:
+        query = query.add_columns(
+            *(c.label(f"cover_{c.key}") for c in COVER_PHOTO.c)
+        ).outerjoin(COVER_PHOTO, true())
+
+    # Pinned first, then by date desc
+    query = query.order_by(*(desc(col) for col in TIMELINE_KEY))
+    if after is not None:
+        query = query.where(tuple_(*TIMELINE_KEY) < tuple_(*after))
+    else:
+        query = query.offset((page - 1) * per_page)
+    memories = (await db.execute(query.limit(per_page + 1))).all()
 
-    # Fetch with photos — pinned first, then by date desc
-    query = (
-        query
-        .order_by(desc(Memory.pinned), desc(Memory.memory_date), desc(Memory.created_at))
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-    )
-    memories = (await db.execute(query)).scalars().all()
+    next_cursor = None
+    if len(memories) > per_page:
+        memories = memories[:per_page]
+        next_cursor = _encode_cursor(memories[-1])
 
     # Fetch photos for these memories
-    if memories:
-        memory_ids = [m.id for m in memories]
-        photos = (
-            await db.execute(
-                select(Photo).where(Photo.memory_id.in_(memory_ids)).order_by(Photo.sort_order)
-            )
-        ).scalars().all()
-        photo_map: dict[UUID, list[Photo]] = {}
-        for p in photos:
-            photo_map.setdefault(p.memory_id, []).append(p)
-    else:
-        photo_map = {}
-
-    return MemoryListResponse(
-        memories=[_memory_response(m, photo_map.get(m.id, [])) for m in memories],
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+    photo_map: dict[UUID, list[dict]] = {}
+    if memories and "photos" in wanted:
+        photos = await db.execute(
+            select(Photo.memory_id, *PHOTO_COLUMNS)
+            .where(Photo.memory_id.in_([m.id for m in memories]))
+            .order_by(Photo.sort_order)
+        )
+        for memory_id, *photo in photos:
+            photo_map.setdefault(memory_id, []).append(dict(zip(PHOTO_KEYS, photo)))
+
+    items = []
+    for m in memories:
+        item = {}
+        for key in wanted:
+            if key == "photos":
+                item[key] = photo_map.get(m.id, [])
+            elif key == "cover_photo":
+                item[key] = {k: m._mapping[f"cover_{k}"] for k in PHOTO_KEYS} if m.cover_id else None
+            elif key == "tags":
+                item[key] = m.tags or []
+            else:
+                item[key] = m._mapping[key]
+        items.append(item)
+
+    # Rendered straight from the rows; returning a Response skips
+    # response_model validation, so the keys must match MemoryListResponse
+    # (or MemoryCardListResponse for view=card).
+    return RowsResponse({
+        "memories": items,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+    }, headers=list_headers(etag))
 
 
 @router.post("", response_model=MemoryResponse, status_code=201)
@@ -123,23 +262,161 @@ async def create_memory(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    memory = Memory(
-        household_id=household.id,
-        created_by=uid,
-        title=data.title.strip(),
-        content=data.content,
-        memory_date=data.memory_date,
-        location=data.location,
-        mood=data.mood,
-        tags=data.tags,
-        pinned=data.pinned,
+    memory = await db.scalar(
+        insert(Memory)
+        .values(
+            household_id=household.id,
+            created_by=uid,
+            title=data.title.strip(),
+            content=data.content,
+            memory_date=data.memory_date,
+            location=data.location,
+            mood=data.mood,
+            tags=data.tags,
+            pinned=data.pinned,
+        )
+        .returning(Memory)
     )
-    db.add(memory)
+    await record_change(household.id, db, change("memory", "created", memory.id))
     await db.commit()
-    await db.refresh(memory)
+    household_changed(household.id)
     return _memory_response(memory, [])
 
 
+# New tag list for a memory: existing tags plus :add, minus :remove, in
+# first-seen order without duplicates.
+_RETAGGED = text("""
+    ARRAY(
+        SELECT t FROM unnest(coalesce(tags, '{}') || :add) WITH ORDINALITY AS u(t, n)
+        WHERE t <> ALL(:remove)
+        GROUP BY t
+        ORDER BY min(n)
+    )
+""")
+
+
+@router.post("/batch", response_model=BatchResult)
+async def batch_memories(
+    data: MemoryBatch,
+    user: ShelfUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Apply many create/update/delete/pin/tag operations in one transaction.
+
+    Operations are grouped by kind and run as set-based statements: creates,
+    then updates, pins, tag changes and finally deletes. Items naming a
+    memory outside the household are reported as not_found and skipped.
+    """
+    uid = UUID(user.id)
+    household = await get_user_household(uid, db)
+    if not household:
+        raise HTTPException(status_code=404, detail="No household found")
+
+    ops = data.ops
+    referenced = {op.id for op in ops if op.op != "create"}
+    found = set()
+    if referenced:
+        found = set(
+            (
+                await db.scalars(
+                    select(Memory.id)
+                    .where(Memory.id.in_(referenced), Memory.household_id == household.id)
+                    .with_for_update()
+                )
+            ).all()
+        )
+
+    results = [
+        BatchItemResult(
+            index=i,
+            op=op.op,
+            id=str(op.id) if op.op != "create" else None,
+            status="ok" if op.op == "create" or op.id in found else "not_found",
+        )
+        for i, op in enumerate(ops)
+    ]
+    live = [(i, op) for i, op in enumerate(ops) if results[i].status == "ok"]
+
+    creates = [(i, op.data) for i, op in live if op.op == "create"]
+    if creates:
+        new_ids = (
+            await db.scalars(
+                insert(Memory).returning(Memory.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "household_id": household.id,
+                        "created_by": uid,
+                        "title": m.title.strip(),
+                        "content": m.content,
+                        "memory_date": m.memory_date,
+                        "location": m.location,
+                        "mood": m.mood,
+                        "tags": m.tags,
+                        "pinned": m.pinned,
+                    }
+                    for _, m in creates
+                ],
+            )
+        ).all()
+        for (i, _), memory_id in zip(creates, new_ids):
+            results[i].id = str(memory_id)
+
+    # One executemany per distinct set of updated columns
+    updates: dict[frozenset, list[dict]] = defaultdict(list)
+    for _, op in live:
+        if op.op == "update":
+            values = op.data.model_dump(exclude_unset=True)
+            if values.get("title"):
+                values["title"] = values["title"].strip()
+            if values:
+                updates[frozenset(values)].append({"id": op.id, **values})
+    for rows in updates.values():
+        await db.execute(update(Memory), rows)
+
+    pins: dict[bool, list[UUID]] = defaultdict(list)
+    for _, op in live:
+        if op.op == "pin":
+            pins[op.pinned].append(op.id)
+    for pinned, ids in pins.items():
+        await db.execute(
+            update(Memory)
+            .where(Memory.id.in_(ids))
+            .values(pinned=pinned)
+            .execution_options(synchronize_session=False)
+        )
+
+    # Retagging many memories the same way is a single UPDATE
+    tags: dict[tuple, list[UUID]] = defaultdict(list)
+    for _, op in live:
+        if op.op == "tag" and (op.add or op.remove):
+            tags[(tuple(op.add), tuple(op.remove))].append(op.id)
+    for (add, remove), ids in tags.items():
+        await db.execute(
+            update(Memory)
+            .where(Memory.id.in_(ids))
+            .values(tags=_RETAGGED.bindparams(
+                bindparam("add", list(add), type_=ARRAY(Text)),
+                bindparam("remove", list(remove), type_=ARRAY(Text)),
+            ))
+            .execution_options(synchronize_session=False)
+        )
+
+    released = ReleasedFiles()
+    deletes = [op.id for _, op in live if op.op == "delete"]
+    if deletes:
+        photos = (await db.scalars(select(Photo).where(Photo.memory_id.in_(deletes)))).all()
+        released = await release_photos(list(photos), db)
+        await db.execute(
+            delete(Memory).where(Memory.id.in_(deletes)).execution_options(synchronize_session=False)
+        )
+
+    await record_change(household.id, db, *batch_changes("memory", results))
+    await db.commit()
+    household_changed(household.id)
+    await delete_released(released)
+    return BatchResult(results=results)
+
+
 @router.get("/{memory_id}", response_model=MemoryResponse)
 async def get_memory(
     memory_id: str,
@@ -153,21 +430,21 @@ async def get_memory(
 
     memory = (
         await db.execute(
-            select(Memory).where(
+            select(*MEMORY_COLUMNS).where(
                 Memory.id == UUID(memory_id),
                 Memory.household_id == household.id,
             )
         )
-    ).scalar_one_or_none()
+    ).one_or_none()
 
     if not memory:
         raise HTTPException(status_code=404, detail="Memory not found")
 
     photos = (
         await db.execute(
-            select(Photo).where(Photo.memory_id == memory.id).order_by(Photo.sort_order)
+            select(*PHOTO_COLUMNS).where(Photo.memory_id == memory.id).order_by(Photo.sort_order)
         )
-    ).scalars().all()
+    ).all()
 
     return _memory_response(memory, list(photos))
 
@@ -184,34 +461,38 @@ async def update_memory(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    memory = (
-        await db.execute(
-            select(Memory).where(
-                Memory.id == UUID(memory_id),
-                Memory.household_id == household.id,
-            )
-        )
-    ).scalar_one_or_none()
-
-    if not memory:
-        raise HTTPException(status_code=404, detail="Memory not found")
-
     update_data = data.model_dump(exclude_unset=True)
     if "title" in update_data and update_data["title"]:
         update_data["title"] = update_data["title"].strip()
-    for key, value in update_data.items():
-        setattr(memory, key, value)
-
-    await db.commit()
-    await db.refresh(memory)
 
-    photos = (
+    where = (Memory.id == UUID(memory_id), Memory.household_id == household.id)
+    if update_data:
+        target = update(Memory).where(*where).values(**update_data).returning(*MEMORY_COLUMNS)
+    else:
+        target = select(*MEMORY_COLUMNS).where(*where)
+    target = target.cte("target")
+    # The memory and its photos in one statement: one row per photo, or a
+    # single row with null photo columns
+    rows = (
         await db.execute(
-            select(Photo).where(Photo.memory_id == memory.id).order_by(Photo.sort_order)
+            select(target, *(c.label(f"photo_{c.key}") for c in PHOTO_COLUMNS))
+            .select_from(target)
+            .outerjoin(Photo, Photo.memory_id == target.c.id)
+            .order_by(Photo.sort_order)
         )
-    ).scalars().all()
+    ).all()
 
-    return _memory_response(memory, list(photos))
+    if not rows:
+        raise HTTPException(status_code=404, detail="Memory not found")
+    memory = rows[0]
+    photos = [Photo(**{k: r._mapping[f"photo_{k}"] for k in PHOTO_KEYS}) for r in rows if r.photo_id]
+
+    if update_data:
+        await record_change(household.id, db, change("memory", "updated", memory.id))
+        await db.commit()
+        household_changed(household.id)
+
+    return _memory_response(memory, photos)
 
 
 @router.delete("/{memory_id}", status_code=204)
@@ -237,15 +518,15 @@ async def delete_memory(
     if not memory:
         raise HTTPException(status_code=404, detail="Memory not found")
 
-    # Delete photo files from disk
     photos = (
         await db.execute(select(Photo).where(Photo.memory_id == memory.id))
     ).scalars().all()
-
-    for photo in photos:
-        file_path = Path(settings.data_dir) / photo.file_path
-        if file_path.exists():
-            file_path.unlink()
+    released = await release_photos(list(photos), db)
 
     await db.delete(memory)
+    await record_change(household.id, db, change("memory", "deleted", memory.id))
     await db.commit()
+    household_changed(household.id)
+
+    # Remove files only once the rows are gone
+    await delete_released(released)
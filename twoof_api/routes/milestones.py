@@ -1,48 +1,112 @@
 from uuid import UUID
-from datetime import date
+from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, literal, Boolean, Date, Row
 from shelf_auth_middleware import get_current_user, ShelfUser
 
+from ..changes import change, change_version, household_changed, record_change
 from ..database import get_db
+from ..etags import etag_matches, list_etag, list_headers, not_modified
+from ..fields import fields_query, parse_fields
 from ..models import Milestone
+from ..recurrence import next_occurrence
+from ..responses import RowsResponse
 from ..schemas import MilestoneCreate, MilestoneUpdate, MilestoneResponse
 from .household import get_user_household
 
 router = APIRouter(prefix="/api/milestones", tags=["milestones"])
 
 
-def _days_until(milestone_date: date, recurring: bool) -> int | None:
-    today = date.today()
-    if not recurring:
-        delta = (milestone_date - today).days
-        return delta if delta >= 0 else None
+def scheduled_occurrence(milestone_date: date, recurring: bool):
+    """next_occurrence value for a row being written with these fields."""
+    return next_occurrence(literal(milestone_date, Date), literal(recurring, Boolean), date.today())
+
+
+MILESTONE_COLUMNS = (
+    Milestone.id, Milestone.title, Milestone.description, Milestone.milestone_date,
+    Milestone.recurring, Milestone.icon, Milestone.next_occurrence, Milestone.created_at,
+)
+
+
+MILESTONE_FIELDS = tuple(MilestoneResponse.model_fields)
 
-    # For recurring milestones, find the next occurrence
-    this_year = milestone_date.replace(year=today.year)
-    if this_year >= today:
-        return (this_year - today).days
-    next_year = milestone_date.replace(year=today.year + 1)
-    return (next_year - today).days
+
+def _milestone_row(m) -> dict:
+    """MilestoneResponse fields as raw values, for rendering with RowsResponse."""
+    days_until = (m.next_occurrence - date.today()).days
+    return {
+        "id": m.id,
+        "title": m.title,
+        "description": m.description,
+        "milestone_date": m.milestone_date,
+        "recurring": m.recurring,
+        "icon": m.icon,
+        "days_until": days_until if days_until >= 0 else None,
+        "created_at": m.created_at,
+    }
 
 
 def _milestone_response(m: Milestone) -> MilestoneResponse:
-    return MilestoneResponse(
-        id=str(m.id),
-        title=m.title,
-        description=m.description,
-        milestone_date=m.milestone_date.isoformat(),
-        recurring=m.recurring,
-        icon=m.icon,
-        days_until=_days_until(m.milestone_date, m.recurring),
-        created_at=m.created_at.isoformat(),
+    row = _milestone_row(m)
+    row.update(
+        id=str(row["id"]),
+        milestone_date=row["milestone_date"].isoformat(),
+        created_at=row["created_at"].isoformat(),
+    )
+    return MilestoneResponse(**row)
+
+
+async def refresh_next_occurrences(household_id: UUID, db: AsyncSession) -> None:
+    """Roll recurring milestones whose stored occurrence has passed to the next one.
+
+    Uses idx_milestones_next, so on most days it touches no rows at all.
+    """
+    today = date.today()
+    result = await db.execute(
+        update(Milestone)
+        .where(
+            Milestone.household_id == household_id,
+            Milestone.next_occurrence < today,
+            Milestone.recurring.is_(True),
+        )
+        .values(next_occurrence=next_occurrence(Milestone.milestone_date, Milestone.recurring, today))
+        .execution_options(synchronize_session=False)
     )
+    if result.rowcount:
+        await db.commit()
+
+
+async def upcoming_milestones(
+    household_id: UUID,
+    db: AsyncSession,
+    within_days: int | None = None,
+    limit: int | None = None,
+) -> list[Row]:
+    """MILESTONE_COLUMNS rows ordered by next occurrence, past one-offs last."""
+    await refresh_next_occurrences(household_id, db)
+    today = date.today()
+
+    query = select(*MILESTONE_COLUMNS).where(Milestone.household_id == household_id)
+    if within_days is not None:
+        query = query.where(
+            Milestone.next_occurrence >= today,
+            Milestone.next_occurrence <= today + timedelta(days=within_days),
+        ).order_by(Milestone.next_occurrence)
+    else:
+        query = query.order_by(Milestone.next_occurrence < today, Milestone.next_occurrence)
+    if limit is not None:
+        query = query.limit(limit)
+    return list((await db.execute(query)).all())
 
 
 @router.get("", response_model=list[MilestoneResponse])
 async def list_milestones(
+    request: Request,
+    upcoming_within: int | None = Query(None, ge=0, le=3660),
+    limit: int | None = Query(None, ge=1, le=500),
+    fields: str | None = fields_query(),
     user: ShelfUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -51,18 +115,18 @@ async def list_milestones(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    rows = (
-        await db.execute(
-            select(Milestone)
-            .where(Milestone.household_id == household.id)
-            .order_by(Milestone.milestone_date)
-        )
-    ).scalars().all()
+    wanted = parse_fields(fields, MILESTONE_FIELDS)
+    # days_until moves with the calendar, so the tag carries today's date
+    version = await change_version(household.id, db)
+    etag = list_etag(household.id, version, date.today())
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    results = [_milestone_response(m) for m in rows]
-    # Sort by upcoming first (non-null days_until, ascending)
-    results.sort(key=lambda m: (m.days_until is None, m.days_until or 0))
-    return results
+    rows = await upcoming_milestones(household.id, db, within_days=upcoming_within, limit=limit)
+    return RowsResponse([
+        {key: value for key, value in _milestone_row(m).items() if key in wanted}
+        for m in rows
+    ], headers=list_headers(etag))
 
 
 @router.post("", response_model=MilestoneResponse, status_code=201)
@@ -76,17 +140,22 @@ async def create_milestone(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    milestone = Milestone(
-        household_id=household.id,
-        title=data.title.strip(),
-        description=data.description,
-        milestone_date=data.milestone_date,
-        recurring=data.recurring,
-        icon=data.icon,
+    milestone = await db.scalar(
+        insert(Milestone)
+        .values(
+            household_id=household.id,
+            title=data.title.strip(),
+            description=data.description,
+            milestone_date=data.milestone_date,
+            recurring=data.recurring,
+            icon=data.icon,
+            next_occurrence=scheduled_occurrence(data.milestone_date, data.recurring),
+        )
+        .returning(Milestone)
     )
-    db.add(milestone)
+    await record_change(household.id, db, change("milestone", "created", milestone.id))
     await db.commit()
-    await db.refresh(milestone)
+    household_changed(household.id)
     return _milestone_response(milestone)
 
 
@@ -102,26 +171,28 @@ async def update_milestone(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
-    milestone = (
-        await db.execute(
-            select(Milestone).where(
-                Milestone.id == UUID(milestone_id),
-                Milestone.household_id == household.id,
-            )
-        )
-    ).scalar_one_or_none()
-
-    if not milestone:
-        raise HTTPException(status_code=404, detail="Milestone not found")
-
     update_data = data.model_dump(exclude_unset=True)
     if "title" in update_data and update_data["title"]:
         update_data["title"] = update_data["title"].strip()
-    for key, value in update_data.items():
-        setattr(milestone, key, value)
 
+    # Reschedule from the row's final date/recurrence; SET sees the old values
+    milestone_date = (
+        literal(update_data["milestone_date"], Date) if "milestone_date" in update_data else Milestone.milestone_date
+    )
+    recurring = literal(update_data["recurring"], Boolean) if "recurring" in update_data else Milestone.recurring
+    milestone = await db.scalar(
+        update(Milestone)
+        .where(Milestone.id == UUID(milestone_id), Milestone.household_id == household.id)
+        .values(**update_data, next_occurrence=next_occurrence(milestone_date, recurring, date.today()))
+        .returning(Milestone)
+    )
+
+    if not milestone:
+        raise HTTPException(status_code=404, detail="Milestone not found")
+
+    await record_change(household.id, db, change("milestone", "updated", milestone.id))
     await db.commit()
-    await db.refresh(milestone)
+    household_changed(household.id)
     return _milestone_response(milestone)
 
 
@@ -149,4 +220,6 @@ async def delete_milestone(
         raise HTTPException(status_code=404, detail="Milestone not found")
 
     await db.delete(milestone)
+    await record_change(household.id, db, change("milestone", "deleted", milestone.id))
     await db.commit()
+    household_changed(household.id)
@@ -0,0 +1,128 @@
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc, true
+from shelf_auth_middleware import get_current_user, ShelfUser
+
+from ..changes import change_version, overview_cache
+from ..database import get_db
+from ..models import Memory, Photo, DateIdea, Milestone
+from ..schemas import OverviewMemory, OverviewResponse, OverviewTotals, PhotoResponse
+from .household import get_user_household
+from .memories import COVER_PHOTO, PHOTO_COUNT, TIMELINE_KEY
+from .milestones import _milestone_response, upcoming_milestones
+
+router = APIRouter(prefix="/api", tags=["overview"])
+
+RECENT_MEMORIES = 3
+UPCOMING_MILESTONES = 3
+UPCOMING_WINDOW_DAYS = 366
+
+
+def _count(model, *where):
+    return select(func.count()).select_from(model).where(*where).scalar_subquery()
+
+
+async def _build_overview(hid: UUID, db: AsyncSession) -> OverviewResponse:
+    # 1. Every total in a single row
+    totals = (
+        await db.execute(
+            select(
+                _count(Memory, Memory.household_id == hid).label("memories"),
+                select(func.count())
+                .select_from(Photo)
+                .join(Memory, Memory.id == Photo.memory_id)
+                .where(Memory.household_id == hid)
+                .scalar_subquery()
+                .label("photos"),
+                _count(Milestone, Milestone.household_id == hid).label("milestones"),
+                _count(DateIdea, DateIdea.household_id == hid, DateIdea.done.is_(False)).label("ideas_open"),
+                _count(DateIdea, DateIdea.household_id == hid, DateIdea.done.is_(True)).label("ideas_done"),
+            )
+        )
+    ).one()
+
+    # 2. Open date ideas per priority
+    by_priority = (
+        await db.execute(
+            select(DateIdea.priority, func.count())
+            .where(DateIdea.household_id == hid, DateIdea.done.is_(False))
+            .group_by(DateIdea.priority)
+        )
+    ).all()
+
+    # 3. Most recent memories, each with its first photo and photo count
+    cover = COVER_PHOTO
+    recent = (
+        await db.execute(
+            select(
+                Memory.id, Memory.title, Memory.memory_date, Memory.mood, Memory.pinned,
+                PHOTO_COUNT.label("photo_count"),
+                cover.c.id.label("cover_id"),
+                cover.c.filename, cover.c.mime_type, cover.c.size_bytes,
+                cover.c.sort_order, cover.c.uploaded_at,
+            )
+            .outerjoin(cover, true())
+            .where(Memory.household_id == hid)
+            .order_by(*(desc(col) for col in TIMELINE_KEY))
+            .limit(RECENT_MEMORIES)
+        )
+    ).all()
+
+    # 4. Next few milestones, straight off idx_milestones_next
+    upcoming = await upcoming_milestones(hid, db, within_days=UPCOMING_WINDOW_DAYS, limit=UPCOMING_MILESTONES)
+
+    return OverviewResponse(
+        recent_memories=[
+            OverviewMemory(
+                id=str(r.id),
+                title=r.title,
+                memory_date=r.memory_date.isoformat(),
+                mood=r.mood,
+                pinned=r.pinned,
+                photo_count=r.photo_count,
+                cover_photo=PhotoResponse(
+                    id=str(r.cover_id),
+                    filename=r.filename,
+                    mime_type=r.mime_type,
+                    size_bytes=r.size_bytes,
+                    sort_order=r.sort_order,
+                    uploaded_at=r.uploaded_at.isoformat(),
+                ) if r.cover_id else None,
+            )
+            for r in recent
+        ],
+        upcoming_milestones=[_milestone_response(m) for m in upcoming],
+        open_date_ideas_by_priority={priority: count for priority, count in by_priority},
+        totals=OverviewTotals(
+            memories=totals.memories,
+            photos=totals.photos,
+            milestones=totals.milestones,
+            date_ideas_open=totals.ideas_open,
+            date_ideas_done=totals.ideas_done,
+        ),
+    )
+
+
+@router.get("/overview", response_model=OverviewResponse)
+async def get_overview(
+    user: ShelfUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    uid = UUID(user.id)
+    household = await get_user_household(uid, db)
+    if not household:
+        raise HTTPException(status_code=404, detail="No household found")
+
+    # The cache is per worker, so an entry is only served while the change
+    # version (bumped by writes on any worker) and the date behind
+    # days_until still match
+    stamp = (await change_version(household.id, db), date.today())
+    cached = overview_cache.get(household.id)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    overview = await _build_overview(household.id, db)
+    overview_cache.set(household.id, (stamp, overview))
+    return overview
@@ -1,20 +1,40 @@
-import uuid as uuid_mod
+import asyncio
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass, field
 from uuid import UUID
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, func, update, delete, or_, literal, text, bindparam, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert as pg_insert
 from shelf_auth_middleware import get_current_user, ShelfUser
 
+from ..changes import change, household_changed, record_change
 from ..config import settings
-from ..database import get_db
-from ..models import Memory, Photo
+from ..database import get_db, async_session
+from ..etags import etag_matches
+from ..images import DERIVATIVE_WIDTHS, derivative_path, generate_derivative
+from ..metrics import PHOTO_UPLOAD_BYTES
+from ..models import Household, Memory, Photo, PhotoBlob
 from ..schemas import PhotoResponse
+from ..storage import (
+    FileTooLargeError,
+    StagedFile,
+    blob_path,
+    delete_files,
+    discard_staged,
+    place_staged,
+    stage_upload,
+    stat_file,
+)
 from .household import get_user_household
 
 router = APIRouter(prefix="/api", tags=["photos"])
+logger = logging.getLogger("twoof.photos")
 
 ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
@@ -26,6 +46,20 @@ EXT_MAP = {
     "image/gif": ".gif",
 }
 
+# Advisory lock class for blob files, keyed by hashtext(content_hash)
+BLOB_LOCK_CLASS = 0x7477
+
+# Locks in array order, so concurrent callers can't deadlock
+_LOCK_BLOBS = text("""
+    SELECT pg_advisory_xact_lock(:lock_class, hashtext(h))
+    FROM unnest(CAST(:hashes AS text[])) WITH ORDINALITY AS u(h, n)
+    ORDER BY n
+""")
+
+# Photo bytes never change once stored (edits mean a new upload), so clients
+# may keep them for as long as they like.
+PHOTO_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
 
 @router.post("/memories/{memory_id}/photos", response_model=list[PhotoResponse], status_code=201)
 async def upload_photos(
@@ -39,62 +73,94 @@ async def upload_photos(
     if not household:
         raise HTTPException(status_code=404, detail="No household found")
 
+    # Memory check and current max sort order in one query
+    max_order = (
+        select(func.coalesce(func.max(Photo.sort_order), -1))
+        .where(Photo.memory_id == Memory.id)
+        .scalar_subquery()
+    )
     memory = (
         await db.execute(
-            select(Memory).where(
+            select(Memory.id, max_order).where(
                 Memory.id == UUID(memory_id),
                 Memory.household_id == household.id,
             )
         )
-    ).scalar_one_or_none()
+    ).one_or_none()
 
     if not memory:
         raise HTTPException(status_code=404, detail="Memory not found")
+    target_id, last_order = memory
 
-    # Get current max sort order
-    max_order = (
-        await db.execute(
-            select(func.coalesce(func.max(Photo.sort_order), -1)).where(
-                Photo.memory_id == memory.id
-            )
-        )
-    ).scalar() or -1
-
-    photos_dir = Path(settings.data_dir) / "photos"
-    photos_dir.mkdir(parents=True, exist_ok=True)
-
-    results = []
-    for i, file in enumerate(files):
+    for file in files:
         if file.content_type not in ALLOWED_TYPES:
             raise HTTPException(
                 status_code=400,
                 detail=f"File type {file.content_type} not allowed. Use JPEG, PNG, WebP, or GIF.",
             )
 
-        content = await file.read()
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail=f"File too large (max 10MB)")
-
-        ext = EXT_MAP.get(file.content_type, ".bin")
-        file_id = uuid_mod.uuid4()
-        relative_path = f"photos/{file_id}{ext}"
-        disk_path = Path(settings.data_dir) / relative_path
-        disk_path.write_bytes(content)
-
-        photo = Photo(
-            memory_id=memory.id,
-            file_path=relative_path,
-            filename=file.filename or f"photo{ext}",
-            mime_type=file.content_type,
-            size_bytes=len(content),
-            sort_order=max_order + 1 + i,
-        )
-        db.add(photo)
-        results.append(photo)
+    staged: list[StagedFile] = []
+    try:
+        for file in files:
+            try:
+                staged.append(await stage_upload(file, MAX_FILE_SIZE))
+            except FileTooLargeError:
+                raise HTTPException(status_code=400, detail=f"File too large (max 10MB)")
 
-    await db.commit()
-    for p in results:
-        await db.refresh(p)
+        # Take a reference per photo on its blob, one upsert for the whole
+        # batch; identical bytes share one file.
+        refs = Counter(item.content_hash for item in staged)
+        await lock_blobs(refs, db)
+        blobs = {}
+        for file, item in zip(files, staged):
+            blobs.setdefault(item.content_hash, {
+                "content_hash": item.content_hash,
+                "file_path": blob_path(item.content_hash, EXT_MAP.get(file.content_type, ".bin")),
+                "size_bytes": item.size_bytes,
+                "ref_count": refs[item.content_hash],
+            })
+        stmt = pg_insert(PhotoBlob).values(list(blobs.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PhotoBlob.content_hash],
+            set_={"ref_count": PhotoBlob.ref_count + stmt.excluded.ref_count},
+        ).returning(PhotoBlob.content_hash, PhotoBlob.file_path)
+        file_paths = dict((await db.execute(stmt)).all())
+
+        results = (
+            await db.scalars(
+                insert(Photo).returning(Photo, sort_by_parameter_order=True),
+                [
+                    {
+                        "memory_id": target_id,
+                        "file_path": file_paths[item.content_hash],
+                        "content_hash": item.content_hash,
+                        "filename": file.filename or f"photo{EXT_MAP.get(file.content_type, '.bin')}",
+                        "mime_type": file.content_type,
+                        "size_bytes": item.size_bytes,
+                        "sort_order": last_order + 1 + i,
+                    }
+                    for i, (file, item) in enumerate(zip(files, staged))
+                ],
+            )
+        ).all()
+
+        # Files go in place before commit (under the blob lock): a rollback
+        # leaves at most an unreferenced blob file, never a row without one.
+        for item, photo in zip(staged, results):
+            await place_staged(item, Path(settings.data_dir) / photo.file_path)
+
+        await record_change(
+            household.id,
+            db,
+            change("photo", "created", *(p.id for p in results)),
+            change("memory", "updated", target_id),
+        )
+        await db.commit()
+    except BaseException:
+        await discard_staged(staged)
+        raise
+    household_changed(household.id)
+    PHOTO_UPLOAD_BYTES.inc(sum(item.size_bytes for item in staged))
 
     return [
         PhotoResponse(
@@ -109,75 +175,219 @@ async def upload_photos(
     ]
 
 
-@router.get("/photos/{photo_id}/file")
-async def serve_photo(
-    photo_id: str,
-    user: ShelfUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    uid = UUID(user.id)
-    household = await get_user_household(uid, db)
-    if not household:
-        raise HTTPException(status_code=404, detail="No household found")
+async def lock_blobs(content_hashes, db: AsyncSession) -> None:
+    """Hold the blob lock for each hash until `db` commits.
 
-    photo = (await db.execute(select(Photo).where(Photo.id == UUID(photo_id)))).scalar_one_or_none()
-    if not photo:
-        raise HTTPException(status_code=404, detail="Photo not found")
+    Taken by every transaction that places blob files (uploads, imports) and
+    by delete_released before unlinking, so a file is never removed while a
+    new reference to it is being committed.
+    """
+    hashes = sorted(set(content_hashes))
+    if hashes:
+        await db.execute(_LOCK_BLOBS.bindparams(
+            bindparam("lock_class", BLOB_LOCK_CLASS),
+            bindparam("hashes", hashes, type_=ARRAY(Text)),
+        ))
 
-    # Verify photo belongs to this household
-    memory = (
-        await db.execute(
-            select(Memory).where(
-                Memory.id == photo.memory_id,
-                Memory.household_id == household.id,
+
+@dataclass
+class ReleasedFiles:
+    """Files to remove once the transaction that released them commits."""
+
+    files: list[Path] = field(default_factory=list)  # derivatives, pre-dedup originals
+    blobs: dict[str, Path] = field(default_factory=dict)  # content hash -> unreferenced blob
+
+
+async def release_photos(photos: list[Photo], db: AsyncSession) -> ReleasedFiles:
+    """Drop the blob references held by `photos` ahead of deleting them.
+
+    Blobs losing their last reference are removed from the table; their
+    files, like the per-photo ones, are left for delete_released to remove
+    after commit, so a rollback never leaves rows without files.
+    """
+    data_dir = Path(settings.data_dir)
+    released = ReleasedFiles()
+    refs: Counter[str] = Counter()
+    for photo in photos:
+        released.files += [data_dir / derivative_path(photo.id, size) for size in (photo.derivatives or {})]
+        if photo.content_hash:
+            refs[photo.content_hash] += 1
+        else:
+            released.files.append(data_dir / photo.file_path)
+
+    for content_hash, count in refs.items():
+        blob = (
+            await db.execute(
+                update(PhotoBlob)
+                .where(PhotoBlob.content_hash == content_hash)
+                .values(ref_count=PhotoBlob.ref_count - count)
+                .returning(PhotoBlob.ref_count, PhotoBlob.file_path)
+                .execution_options(synchronize_session=False)
             )
+        ).one_or_none()
+        if blob is not None and blob.ref_count <= 0:
+            await db.execute(delete(PhotoBlob).where(PhotoBlob.content_hash == content_hash))
+            released.blobs[content_hash] = data_dir / blob.file_path
+
+    return released
+
+
+async def delete_released(released: ReleasedFiles) -> None:
+    """Remove released files; call after the releasing transaction commits.
+
+    A blob file is kept if its hash has a row again by now: an upload of the
+    same bytes took it over in the meantime.
+    """
+    await delete_files(released.files)
+    if not released.blobs:
+        return
+    async with async_session() as session:
+        await lock_blobs(released.blobs, session)
+        live = set(
+            (
+                await session.scalars(
+                    select(PhotoBlob.content_hash).where(PhotoBlob.content_hash.in_(released.blobs))
+                )
+            ).all()
         )
-    ).scalar_one_or_none()
+        await delete_files([path for h, path in released.blobs.items() if h not in live])
+        await session.commit()
 
-    if not memory:
+
+async def _derivative_file(photo: Photo, size: str, db: AsyncSession) -> Path | None:
+    """Return the derivative for `size`, rendering it on first request."""
+    derived = Path(settings.data_dir) / derivative_path(photo.id, size)
+    if size in (photo.derivatives or {}) and await stat_file(derived) is not None:
+        return derived
+
+    source = Path(settings.data_dir) / photo.file_path
+    try:
+        meta = await asyncio.to_thread(generate_derivative, source, derived, DERIVATIVE_WIDTHS[size])
+    except Exception as exc:
+        logger.warning(f"Could not render {size} derivative for photo {photo.id}: {exc}")
+        return None
+
+    # Merge in SQL so concurrent renders of other sizes aren't overwritten
+    await db.execute(
+        update(Photo)
+        .where(Photo.id == photo.id)
+        .values(derivatives=Photo.derivatives.op("||")(literal({size: meta}, JSONB)))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return derived
+
+
+# What serve_photo needs to answer; never the full entity on the hot path
+SERVE_COLUMNS = (
+    Photo.id, Photo.file_path, Photo.content_hash, Photo.filename,
+    Photo.mime_type, Photo.size_bytes, Photo.derivatives,
+)
+
+
+def _authorized_photo(photo_id: str, user_id: UUID, *columns):
+    """Select `columns` of a photo only if it belongs to a household
+    `user_id` is a member of.
+
+    Ownership is checked in the same statement (photo -> memory -> household)
+    so the hottest route in the app costs a single round trip.
+    """
+    return (
+        select(*columns)
+        .join(Memory, Memory.id == Photo.memory_id)
+        .join(Household, Household.id == Memory.household_id)
+        .where(
+            Photo.id == UUID(photo_id),
+            or_(Household.user_a_id == user_id, Household.user_b_id == user_id),
+        )
+    )
+
+
+async def get_authorized_photo(photo_id: str, user_id: UUID, db: AsyncSession) -> tuple[Photo, UUID]:
+    """Fetch a photo entity (and its household id), or 404."""
+    row = (await db.execute(_authorized_photo(photo_id, user_id, Photo, Memory.household_id))).one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Photo not found")
+    return row.Photo, row.household_id
 
-    file_path = Path(settings.data_dir) / photo.file_path
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="File not found on disk")
 
+def _photo_etag(photo: Photo, size: str) -> str:
+    if size != "full":
+        return f'"{photo.id}-{size}"'
+    if photo.content_hash:
+        return f'"{photo.content_hash}"'
+    return f'"{photo.id}-{photo.size_bytes}"'
+
+
+def _photo_file_response(
+    path: Path, media_type: str, filename: str, etag: str, stat_result: os.stat_result | None = None
+) -> FileResponse:
+    # FileResponse answers Range / If-Range requests itself, and skips its
+    # own stat when handed one.
     return FileResponse(
-        path=str(file_path),
-        media_type=photo.mime_type,
-        filename=photo.filename,
+        path=str(path),
+        media_type=media_type,
+        filename=filename,
+        headers={"ETag": etag, "Cache-Control": PHOTO_CACHE_CONTROL},
+        stat_result=stat_result,
     )
 
 
-@router.delete("/photos/{photo_id}", status_code=204)
-async def delete_photo(
+@router.get("/photos/{photo_id}/file")
+async def serve_photo(
     photo_id: str,
+    request: Request,
+    size: str = Query("full", pattern="^(thumb|medium|full)$"),
     user: ShelfUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    uid = UUID(user.id)
-    household = await get_user_household(uid, db)
-    if not household:
-        raise HTTPException(status_code=404, detail="No household found")
-
-    photo = (await db.execute(select(Photo).where(Photo.id == UUID(photo_id)))).scalar_one_or_none()
+    photo = (await db.execute(_authorized_photo(photo_id, UUID(user.id), *SERVE_COLUMNS))).one_or_none()
     if not photo:
         raise HTTPException(status_code=404, detail="Photo not found")
 
-    memory = (
-        await db.execute(
-            select(Memory).where(
-                Memory.id == photo.memory_id,
-                Memory.household_id == household.id,
+    # Answer revalidation from the row alone. A derivative's tag is only
+    # trusted once it has been rendered; until then the original is served.
+    variant = size if size in (photo.derivatives or {}) else "full"
+    etag = _photo_etag(photo, variant)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": PHOTO_CACHE_CONTROL})
+
+    file_path = Path(settings.data_dir) / photo.file_path
+    file_stat = await stat_file(file_path)
+    if file_stat is None:
+        raise HTTPException(status_code=404, detail="File not found on disk")
+
+    if size != "full":
+        derived = await _derivative_file(photo, size, db)
+        if derived is not None:
+            return _photo_file_response(
+                derived,
+                "image/webp",
+                f"{Path(photo.filename).stem}-{size}.webp",
+                _photo_etag(photo, size),
             )
-        )
-    ).scalar_one_or_none()
 
-    if not memory:
-        raise HTTPException(status_code=404, detail="Photo not found")
+    return _photo_file_response(
+        file_path, photo.mime_type, photo.filename, _photo_etag(photo, "full"), file_stat
+    )
 
-    file_path = Path(settings.data_dir) / photo.file_path
-    if file_path.exists():
-        file_path.unlink()
 
+@router.delete("/photos/{photo_id}", status_code=204)
+async def delete_photo(
+    photo_id: str,
+    user: ShelfUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    photo, household_id = await get_authorized_photo(photo_id, UUID(user.id), db)
+
+    released = await release_photos([photo], db)
     await db.delete(photo)
+    await record_change(
+        household_id,
+        db,
+        change("photo", "deleted", photo.id),
+        change("memory", "updated", photo.memory_id),
+    )
     await db.commit()
+    household_changed(household_id)
+    await delete_released(released)
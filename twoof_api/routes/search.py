@@ -6,6 +6,7 @@ from sqlalchemy import text
 from shelf_auth_middleware import get_current_user, ShelfUser
 
 from ..database import get_db
+from ..responses import RowsResponse
 from ..schemas import SearchResult
 from .household import get_user_household
 
@@ -27,35 +28,31 @@ async def search_memories(
     rows = (
         await db.execute(
             text("""
+                WITH hits AS (
+                    SELECT
+                        m.id, m.title, m.content, m.memory_date, m.location,
+                        ts_rank_cd(m.search_vector, q.query) AS rank,
+                        q.query
+                    FROM twoof.memories m,
+                         plainto_tsquery('english', :query) AS q(query)
+                    WHERE m.household_id = :hid
+                      AND m.search_vector @@ q.query
+                    ORDER BY rank DESC, m.memory_date DESC
+                    LIMIT :limit
+                )
+                -- Headlines are costly, so only build them for the rows returned.
                 SELECT
                     id, title, memory_date, location,
                     ts_headline('english',
                         coalesce(title, '') || ' — ' || coalesce(content, ''),
-                        plainto_tsquery('english', :query),
+                        query,
                         'MaxWords=30, MinWords=10, StartSel=**, StopSel=**'
-                    ) AS snippet,
-                    ts_rank(
-                        to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, '')),
-                        plainto_tsquery('english', :query)
-                    ) AS rank
-                FROM twoof.memories
-                WHERE household_id = :hid
-                  AND to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))
-                      @@ plainto_tsquery('english', :query)
-                ORDER BY rank DESC
-                LIMIT :limit
+                    ) AS snippet
+                FROM hits
+                ORDER BY rank DESC, memory_date DESC
             """),
             {"query": q, "hid": str(household.id), "limit": limit},
         )
-    ).fetchall()
+    )
 
-    return [
-        SearchResult(
-            id=str(row.id),
-            title=row.title,
-            snippet=row.snippet or "",
-            memory_date=row.memory_date.isoformat(),
-            location=row.location,
-        )
-        for row in rows
-    ]
+    return RowsResponse([{**row._mapping, "snippet": row.snippet or ""} for row in rows])
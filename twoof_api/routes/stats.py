@@ -0,0 +1,62 @@
+from collections import Counter
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from shelf_auth_middleware import get_current_user, ShelfUser
+
+from ..database import get_db
+from ..models import HouseholdStat
+from ..schemas import StatCount, StatsResponse
+from .household import get_user_household
+
+router = APIRouter(prefix="/api", tags=["stats"])
+
+
+def _ranked(counts: dict[str, int]) -> list[StatCount]:
+    return [StatCount(key=k, count=v) for k, v in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+
+
+def _newest_first(counts: dict[str, int]) -> list[StatCount]:
+    return [StatCount(key=k, count=counts[k]) for k in sorted(counts, reverse=True)]
+
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(
+    user: ShelfUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    uid = UUID(user.id)
+    household = await get_user_household(uid, db)
+    if not household:
+        raise HTTPException(status_code=404, detail="No household found")
+
+    rows = (
+        await db.execute(
+            select(HouseholdStat.kind, HouseholdStat.key, HouseholdStat.count, HouseholdStat.bytes)
+            .where(HouseholdStat.household_id == household.id)
+        )
+    ).all()
+
+    by_kind: dict[str, dict[str, int]] = {"month": {}, "tag": {}, "mood": {}}
+    photos = photo_bytes = 0
+    for kind, key, count, size in rows:
+        if kind == "photos":
+            photos, photo_bytes = count, size
+        elif kind in by_kind:
+            by_kind[kind][key] = count
+
+    years: Counter[str] = Counter()
+    for month, count in by_kind["month"].items():
+        years[month[:4]] += count
+
+    return StatsResponse(
+        memories=sum(by_kind["month"].values()),
+        photos=photos,
+        photo_bytes=photo_bytes,
+        years=_newest_first(years),
+        months=_newest_first(by_kind["month"]),
+        tags=_ranked(by_kind["tag"]),
+        moods=_ranked(by_kind["mood"]),
+    )
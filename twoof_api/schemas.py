@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
 from datetime import date
+from uuid import UUID
 
 
 # ── Household ─────────────────────────────────────────────────────────
@@ -76,9 +77,35 @@ class MemoryResponse(BaseModel):
 
 class MemoryListResponse(BaseModel):
     memories: list[MemoryResponse]
-    total: int
+    total: Optional[int]  # omitted when paging with a cursor
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
+
+
+class MemoryCard(BaseModel):
+    """Timeline card: a content excerpt and cover photo instead of the full memory."""
+    id: str
+    created_by: str
+    title: str
+    excerpt: Optional[str]
+    has_more: bool  # content continues past the excerpt
+    memory_date: str
+    location: Optional[str]
+    mood: Optional[str]
+    tags: list[str]
+    pinned: bool
+    photo_count: int
+    cover_photo: Optional[PhotoResponse]
+    created_at: str
+
+
+class MemoryCardListResponse(BaseModel):
+    memories: list[MemoryCard]
+    total: Optional[int]
+    page: int
+    per_page: int
+    next_cursor: Optional[str] = None
 
 
 # ── Date Idea ─────────────────────────────────────────────────────────
@@ -155,3 +182,165 @@ class SearchResult(BaseModel):
     snippet: str
     memory_date: str
     location: Optional[str]
+
+
+# ── Overview ──────────────────────────────────────────────────────────
+
+class OverviewMemory(BaseModel):
+    id: str
+    title: str
+    memory_date: str
+    mood: Optional[str]
+    pinned: bool
+    photo_count: int
+    cover_photo: Optional[PhotoResponse]
+
+
+class OverviewTotals(BaseModel):
+    memories: int
+    photos: int
+    milestones: int
+    date_ideas_open: int
+    date_ideas_done: int
+
+
+class OverviewResponse(BaseModel):
+    recent_memories: list[OverviewMemory]
+    upcoming_milestones: list[MilestoneResponse]
+    open_date_ideas_by_priority: dict[int, int]
+    totals: OverviewTotals
+
+
+# ── Stats ─────────────────────────────────────────────────────────────
+
+class StatCount(BaseModel):
+    key: str
+    count: int
+
+
+class StatsResponse(BaseModel):
+    memories: int
+    photos: int
+    photo_bytes: int
+    years: list[StatCount]    # "YYYY", newest first
+    months: list[StatCount]   # "YYYY-MM", newest first
+    tags: list[StatCount]     # most used first
+    moods: list[StatCount]    # most used first
+
+
+# ── Import ────────────────────────────────────────────────────────────
+
+class ImportPhoto(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=500)
+    mime_type: str = Field(..., max_length=100)
+    size_bytes: int = Field(0, ge=0)
+    file: Optional[str] = None  # archive path, present in ZIP exports
+
+
+class ImportMemory(MemoryCreate):
+    created_by: Optional[str] = None
+    photos: list[ImportPhoto] = Field(default_factory=list)
+
+
+class ImportDateIdea(DateIdeaCreate):
+    done: bool = False
+    done_date: Optional[date] = None
+    created_by: Optional[str] = None
+
+
+class ImportMilestone(MilestoneCreate):
+    pass
+
+
+class ImportResult(BaseModel):
+    memories: int
+    photos: int
+    date_ideas: int
+    milestones: int
+
+
+# ── Batch ─────────────────────────────────────────────────────────────
+
+MAX_BATCH_OPS = 1000
+
+
+class MemoryBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: MemoryCreate
+
+
+class MemoryBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: UUID
+    data: MemoryUpdate
+
+
+class MemoryBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+class MemoryBatchPin(BaseModel):
+    op: Literal["pin"]
+    id: UUID
+    pinned: bool = True
+
+
+class MemoryBatchTag(BaseModel):
+    op: Literal["tag"]
+    id: UUID
+    add: list[str] = Field(default_factory=list)
+    remove: list[str] = Field(default_factory=list)
+
+
+MemoryBatchOp = Annotated[
+    Union[MemoryBatchCreate, MemoryBatchUpdate, MemoryBatchDelete, MemoryBatchPin, MemoryBatchTag],
+    Field(discriminator="op"),
+]
+
+
+class MemoryBatch(BaseModel):
+    ops: list[MemoryBatchOp] = Field(..., min_length=1, max_length=MAX_BATCH_OPS)
+
+
+class DateIdeaBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: DateIdeaCreate
+
+
+class DateIdeaBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: UUID
+    data: DateIdeaUpdate
+
+
+class DateIdeaBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+class DateIdeaBatchDone(BaseModel):
+    op: Literal["done"]
+    id: UUID
+    done: bool = True
+
+
+DateIdeaBatchOp = Annotated[
+    Union[DateIdeaBatchCreate, DateIdeaBatchUpdate, DateIdeaBatchDelete, DateIdeaBatchDone],
+    Field(discriminator="op"),
+]
+
+
+class DateIdeaBatch(BaseModel):
+    ops: list[DateIdeaBatchOp] = Field(..., min_length=1, max_length=MAX_BATCH_OPS)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[str]
+    status: str  # "ok" | "not_found"
+
+
+class BatchResult(BaseModel):
+    results: list[BatchItemResult]
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from fastapi import UploadFile
+
+from .config import settings
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class FileTooLargeError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class StagedFile:
+    """A fully received upload waiting in a temp file to be moved into place."""
+
+    tmp_path: Path
+    size_bytes: int
+    content_hash: str
+
+
+def photos_dir() -> Path:
+    return Path(settings.data_dir) / "photos"
+
+
+def blob_path(content_hash: str, ext: str) -> str:
+    """Content-addressed location of a photo, relative to data_dir."""
+    return f"photos/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{ext}"
+
+
+def _open_temp(directory: Path):
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    return os.fdopen(fd, "wb"), Path(name)
+
+
+def _close_and_discard(fh, tmp_path: Path) -> None:
+    fh.close()
+    tmp_path.unlink(missing_ok=True)
+
+
+def _close_synced(fh) -> None:
+    fh.flush()
+    os.fsync(fh.fileno())
+    fh.close()
+
+
+async def stage_stream(
+    read: Callable[[int], Awaitable[bytes]], name: str, max_size: int
+) -> StagedFile:
+    """Copy everything `read` yields into a temp file, hashing as it goes.
+
+    All disk I/O happens in worker threads so the event loop keeps serving
+    other requests, and sources that exceed `max_size` are abandoned as soon
+    as the limit is crossed.
+    """
+    fh, tmp_path = await asyncio.to_thread(_open_temp, photos_dir())
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        while chunk := await read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise FileTooLargeError(f"{name} exceeds {max_size} bytes")
+            digest.update(chunk)
+            await asyncio.to_thread(fh.write, chunk)
+        await asyncio.to_thread(_close_synced, fh)
+    except BaseException:
+        await asyncio.to_thread(_close_and_discard, fh, tmp_path)
+        raise
+    return StagedFile(tmp_path=tmp_path, size_bytes=size, content_hash=digest.hexdigest())
+
+
+async def stage_upload(upload: UploadFile, max_size: int) -> StagedFile:
+    return await stage_stream(upload.read, upload.filename or "upload", max_size)
+
+
+def _place(tmp_path: Path, dest: Path) -> None:
+    if dest.exists():
+        # Identical bytes are already stored
+        tmp_path.unlink(missing_ok=True)
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(tmp_path, dest)
+
+
+async def place_staged(staged: StagedFile, dest: Path) -> None:
+    """Atomically move a staged upload to `dest` unless that blob already exists."""
+    await asyncio.to_thread(_place, staged.tmp_path, dest)
+
+
+async def discard_staged(staged: list[StagedFile]) -> None:
+    await delete_files([s.tmp_path for s in staged])
+
+
+def _unlink_all(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+async def delete_files(paths: list[Path]) -> None:
+    """Remove files off the event loop; missing files are ignored."""
+    if paths:
+        await asyncio.to_thread(_unlink_all, paths)
+
+
+async def stat_file(path: Path) -> os.stat_result | None:
+    """os.stat off the event loop; None when the file is missing."""
+    try:
+        return await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        return None